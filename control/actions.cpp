@@ -14,8 +14,9 @@ using namespace phosphor::fan;
 Action call_actions_based_on_timer(Timer&& tConf, std::vector<Action>&& actions)
 {
     return [tConf = std::move(tConf),
-            actions = std::move(actions)](control::Zone& zone,
-                                          const Group& group)
+            actions = std::make_shared<const std::vector<Action>>(
+                std::move(actions))](control::Zone& zone,
+                                     const Group& group)
     {
         try
         {
@@ -29,13 +30,13 @@ Action call_actions_based_on_timer(Timer&& tConf, std::vector<Action>&& actions)
                     return !std::get<hasOwnerPos>(s);
                 });
             if (setTimer &&
-                zone.findTimer(group, actions) ==
+                zone.findTimer(group, *actions) ==
                     std::end(zone.getTimerEvents()))
             {
                 // Associate event data with timer
                 std::unique_ptr<EventData> eventData =
                     std::make_unique<EventData>(
-                            group,
+                            std::make_shared<const Group>(group),
                             "",
                             nullptr,
                             actions
@@ -45,7 +46,7 @@ Action call_actions_based_on_timer(Timer&& tConf, std::vector<Action>&& actions)
                     std::make_unique<util::Timer>(
                             zone.getEventPtr(),
                             [&zone,
-                            actions = &actions,
+                            actions = actions.get(),
                             group = &group]()
                             {
                                 zone.timerExpired(*group, *actions);
@@ -60,7 +61,7 @@ Action call_actions_based_on_timer(Timer&& tConf, std::vector<Action>&& actions)
             else
             {
                 // Stop and remove any timers for this group
-                auto timer = zone.findTimer(group, actions);
+                auto timer = zone.findTimer(group, *actions);
                 if (timer != std::end(zone.getTimerEvents()))
                 {
                     if (std::get<timerTimerPos>(*timer)->running())
@@ -133,9 +134,7 @@ void set_request_speed_base_with_max(control::Zone& zone,
             try
             {
                 auto value = zone.template getPropertyValue<int64_t>(
-                        entry.first,
-                        std::get<intfPos>(entry.second),
-                        std::get<propPos>(entry.second));
+                        std::get<slotPos>(entry.second));
                 base = std::max(base, value);
             }
             catch (const std::out_of_range& oore)
@@ -148,7 +147,7 @@ void set_request_speed_base_with_max(control::Zone& zone,
 }
 
 Action set_floor_from_average_sensor_value(
-        std::map<int64_t, uint64_t>&& val_to_speed)
+        LookupTable<int64_t, uint64_t>&& val_to_speed)
 {
     return [val_to_speed = std::move(val_to_speed)](control::Zone& zone,
                                                     const Group& group)
@@ -167,9 +166,7 @@ Action set_floor_from_average_sensor_value(
                         {
                             return sum +
                                 zone.template getPropertyValue<int64_t>(
-                                    entry.first,
-                                    std::get<intfPos>(entry.second),
-                                    std::get<propPos>(entry.second));
+                                    std::get<slotPos>(entry.second));
                         }
                         catch (const std::out_of_range& oore)
                         {
@@ -181,12 +178,14 @@ Action set_floor_from_average_sensor_value(
             {
                 auto groupSize = static_cast<int64_t>(group.size());
                 auto avgValue = sumValue / (groupSize - count);
-                auto it = std::find_if(
+                // First entry with a key above the average
+                auto it = std::upper_bound(
                     val_to_speed.begin(),
                     val_to_speed.end(),
-                    [&avgValue](auto const& entry)
+                    avgValue,
+                    [](auto const& value, auto const& entry)
                     {
-                        return avgValue < entry.first;
+                        return value < entry.first;
                     }
                 );
                 if (it != std::end(val_to_speed))
@@ -200,7 +199,7 @@ Action set_floor_from_average_sensor_value(
 }
 
 Action set_ceiling_from_average_sensor_value(
-        std::map<int64_t, uint64_t>&& val_to_speed)
+        LookupTable<int64_t, uint64_t>&& val_to_speed)
 {
     return [val_to_speed = std::move(val_to_speed)](Zone& zone,
                                                     const Group& group)
@@ -219,9 +218,7 @@ Action set_ceiling_from_average_sensor_value(
                         {
                             return sum +
                                 zone.template getPropertyValue<int64_t>(
-                                    entry.first,
-                                    std::get<intfPos>(entry.second),
-                                    std::get<propPos>(entry.second));
+                                    std::get<slotPos>(entry.second));
                         }
                         catch (const std::out_of_range& oore)
                         {
@@ -234,74 +231,62 @@ Action set_ceiling_from_average_sensor_value(
                 auto groupSize = static_cast<int64_t>(group.size());
                 auto avgValue = sumValue / (groupSize - count);
                 auto prevValue = zone.swapCeilingKeyValue(avgValue);
-                if (avgValue != prevValue)
+                if (avgValue != prevValue && !val_to_speed.empty())
                 {// Only check if previous and new values differ
-                    if (avgValue < prevValue)
+                    auto first = val_to_speed.begin();
+                    auto last = std::prev(val_to_speed.end());
+                    if (avgValue <= first->first)
+                    {
+                        // Value is at/below first map key, set
+                        // ceiling speed to the first map key's value
+                        speed = first->second;
+                    }
+                    else if (avgValue >= last->first)
+                    {
+                        // Value is at/above last map key, set
+                        // ceiling speed to the last map key's value
+                        speed = last->second;
+                    }
+                    else if (avgValue < prevValue)
                     {// Value is decreasing from previous
-                        for (auto it = val_to_speed.rbegin();
-                             it != val_to_speed.rend();
-                             ++it)
-                        {
-                            if (it == val_to_speed.rbegin() &&
-                                avgValue >= it->first)
-                            {
-                                // Value is at/above last map key, set
-                                // ceiling speed to the last map key's value
-                                speed = it->second;
-                                break;
-                            }
-                            else if (std::next(it, 1) == val_to_speed.rend() &&
-                                     avgValue <= it->first)
+                        // Lowest map key above the new value
+                        auto it = std::upper_bound(
+                            first,
+                            last,
+                            avgValue,
+                            [](auto const& value, auto const& entry)
                             {
-                                // Value is at/below first map key, set
-                                // ceiling speed to the first map key's value
-                                speed = it->second;
-                                break;
-                            }
-                            if (avgValue < it->first &&
-                                it->first <= prevValue)
-                            {
-                                // Value decreased & transitioned across
-                                // a map key, update ceiling speed to this
-                                // map key's value when new value is below
-                                // map's key and the key is at/below the
-                                // previous value
-                                speed = it->second;
-                            }
+                                return value < entry.first;
+                            });
+                        if (it->first <= prevValue)
+                        {
+                            // Value decreased & transitioned across
+                            // a map key, update ceiling speed to this
+                            // map key's value when new value is below
+                            // map's key and the key is at/below the
+                            // previous value
+                            speed = it->second;
                         }
                     }
                     else
                     {// Value is increasing from previous
-                        for (auto it = val_to_speed.begin();
-                             it != val_to_speed.end();
-                             ++it)
-                        {
-                            if (it == val_to_speed.begin() &&
-                                avgValue <= it->first)
+                        // Highest map key below the new value
+                        auto it = std::prev(std::lower_bound(
+                            first,
+                            last,
+                            avgValue,
+                            [](auto const& entry, auto const& value)
                             {
-                                // Value is at/below first map key, set
-                                // ceiling speed to the first map key's value
-                                speed = it->second;
-                                break;
-                            }
-                            else if (std::next(it, 1) == val_to_speed.end() &&
-                                     avgValue >= it->first)
-                            {
-                                // Value is at/above last map key, set
-                                // ceiling speed to the last map key's value
-                                speed = it->second;
-                                break;
-                            }
-                            if (avgValue > it->first &&
-                                it->first >= prevValue)
-                            {
-                                // Value increased & transitioned across
-                                // a map key, update ceiling speed to this
-                                // map key's value when new value is above
-                                // map's key and the key is at/above the
-                                // previous value
-                                speed = it->second;
-                            }
+                                return entry.first < value;
+                            }));
+                        if (it->first >= prevValue)
+                        {
+                            // Value increased & transitioned across
+                            // a map key, update ceiling speed to this
+                            // map key's value when new value is above
+                            // map's key and the key is at/above the
+                            // previous value
+                            speed = it->second;
                         }
                     }
                 }
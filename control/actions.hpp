@@ -94,9 +94,7 @@ auto count_state_before_speed(size_t count, T&& state, uint64_t speed)
             try
             {
                 if (zone.template getPropertyValue<T>(
-                        entry.first,
-                        std::get<intfPos>(entry.second),
-                        std::get<propPos>(entry.second)) == state)
+                        std::get<slotPos>(entry.second)) == state)
                 {
                     numAtState++;
                 }
@@ -122,14 +120,14 @@ auto count_state_before_speed(size_t count, T&& state, uint64_t speed)
  * speed is selected from the first map key entry that the average sensor value
  * is less than.
  *
- * @param[in] val_to_speed - Ordered map of sensor value-to-speed
+ * @param[in] val_to_speed - Sensor value-to-speed table sorted by value
  *
  * @return Action lambda function
  *     An Action function to set the zone's floor speed when the average of
  *     property values within the group is below the lowest sensor value given
  */
 Action set_floor_from_average_sensor_value(
-        std::map<int64_t, uint64_t>&& val_to_speed);
+        LookupTable<int64_t, uint64_t>&& val_to_speed);
 
 /**
  * @brief An action to set the ceiling speed on a zone
@@ -138,7 +136,8 @@ Action set_floor_from_average_sensor_value(
  * sensor value falls within depending on the key values direction from what
  * was previously read.
  *
- * @param[in] val_to_speed - Ordered map of sensor value-to-speed transitions
+ * @param[in] val_to_speed - Sensor value-to-speed transitions table sorted
+ *                           by value
  *
  * @return Action lambda function
  *     An Action function to set the zone's ceiling speed when the average of
@@ -146,7 +145,7 @@ Action set_floor_from_average_sensor_value(
  *     below(decreasing) the key transition point
  */
 Action set_ceiling_from_average_sensor_value(
-        std::map<int64_t, uint64_t>&& val_to_speed);
+        LookupTable<int64_t, uint64_t>&& val_to_speed);
 
 /**
  * @brief An action to set the speed increase delta and request speed change
@@ -179,9 +178,7 @@ auto set_net_increase_speed(T&& state, T&& factor, uint64_t speedDelta)
                 try
                 {
                     T value = zone.template getPropertyValue<T>(
-                            entry.first,
-                            std::get<intfPos>(entry.second),
-                            std::get<propPos>(entry.second));
+                            std::get<slotPos>(entry.second));
                     // TODO openbmc/phosphor-fan-presence#7 - Support possible
                     // state types for comparison
                     if (value >= state)
@@ -236,9 +233,7 @@ auto set_net_decrease_speed(T&& state, T&& factor, uint64_t speedDelta)
             try
             {
                 T value = zone.template getPropertyValue<T>(
-                        entry.first,
-                        std::get<intfPos>(entry.second),
-                        std::get<propPos>(entry.second));
+                        std::get<slotPos>(entry.second));
                 // TODO openbmc/phosphor-fan-presence#7 - Support possible
                 // state types for comparison
                 if (value < state)
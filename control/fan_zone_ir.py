@@ -0,0 +1,217 @@
+"""
+The intermediate representation of the fan zone definitions, built by
+gen-fan-zone-defs.py from the zone, fan, events and zone conditions YAML.
+
+Each node holds the parsed values of its part of the definitions, leaving
+the C++ to the templates rendering the nodes, so the representation can be
+used by other back ends and by validators as well.
+"""
+
+
+class Node(object):
+    """
+    Base of the representation's nodes. Each node lists its fields in its
+    __slots__, any field not given when the node is constructed being None.
+    """
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for field in self.__slots__:
+            setattr(self, field, fields.pop(field, None))
+        if fields:
+            raise TypeError(type(self).__name__ + " has no field " +
+                            ", ".join(sorted(fields)))
+
+    def __getstate__(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def __setstate__(self, state):
+        for field, value in zip(self.__slots__, state):
+            setattr(self, field, value)
+
+    def fields(self):
+        """
+        Returns the node's field values in the order of its __slots__.
+        """
+        return self.__getstate__()
+
+
+class ZoneGroup(Node):
+    """
+    The zones controlled together when all of the group's conditions are
+    met, along with the units the zones are generated in.
+    """
+    __slots__ = ('conditions', 'zones', 'units')
+
+
+class Condition(Node):
+    """
+    A zone group condition, checked by its type against its properties.
+    """
+    __slots__ = ('type', 'properties')
+
+
+class ConditionProperty(Node):
+    """
+    A property of a zone group condition and the value it is checked for.
+    """
+    __slots__ = ('property', 'interface', 'path', 'type', 'value')
+
+
+class Zone(Node):
+    """
+    A fan zone, with its fans and the set speed events controlling them.
+    The fetches are the zone's plan for reading its events' initial
+    property values in bulk, and the buckets its events run by a shared
+    timer, whose indices are also given by bucketed.
+    """
+    __slots__ = ('num', 'full_speed', 'default_floor', 'increase_delay',
+                 'decrease_interval', 'fans', 'events', 'fetches',
+                 'buckets', 'bucketed')
+
+
+class Fan(Node):
+    """
+    A fan within a zone, with its tach sensors and target interface.
+    """
+    __slots__ = ('name', 'sensors', 'target_interface')
+
+
+class Group(Node):
+    """
+    A group of object properties used by an event. The shared field is the
+    name of the generated Group object holding the group's members.
+    """
+    __slots__ = ('name', 'members', 'shared')
+
+
+class Member(Node):
+    """
+    An object property within a group. The path is the object path the
+    group's members are relative to, and the value, when given, the
+    property's expected value, with string set when it is a string.
+    """
+    __slots__ = ('path', 'object', 'interface', 'property', 'type',
+                 'value', 'string')
+
+
+class Event(Node):
+    """
+    A set speed event running its actions on its groups when any of its
+    signals is received or its timer expires. An event enabled by a
+    precondition only has its precondition, holding the events it enables.
+    The group_name and actions_name fields are the names of the generated
+    objects shared with other events, the key identifies the event's
+    groups and signals, and shared_ids are the ids of its signals when
+    their subscriptions are shared with other zones.
+    """
+    __slots__ = ('groups', 'actions', 'signals', 'timer', 'pc',
+                 'group_name', 'actions_name', 'key', 'shared_ids',
+                 'coalesced')
+
+
+class Precondition(Node):
+    """
+    A precondition adding its events to the zone when its actions find
+    its groups' members at their expected values.
+    """
+    __slots__ = ('groups', 'actions', 'events', 'signals', 'timer',
+                 'group_name', 'coalesced')
+
+
+class PrecondAction(Node):
+    """
+    A precondition's action. Each of its parameters is a list of the
+    members whose values are checked.
+    """
+    __slots__ = ('name', 'params')
+
+
+class Timer(Node):
+    """
+    A timer of the given type expiring after its number of seconds.
+    """
+    __slots__ = ('seconds', 'type')
+
+    kind = 'timer'
+
+
+class Action(Node):
+    """
+    An action and its parameters, each either a Literal, Timer, Table or
+    ActionList.
+    """
+    __slots__ = ('name', 'params')
+
+
+class ActionList(Node):
+    """
+    A list of actions, given as a parameter of another action or, when
+    named, generated as an object shared by events.
+    """
+    __slots__ = ('name', 'actions')
+
+    kind = 'actions'
+
+
+class Literal(Node):
+    """
+    A value of a C++ type, with string set when the value is a string.
+    """
+    __slots__ = ('type', 'value', 'string')
+
+    kind = 'literal'
+
+
+class Table(Node):
+    """
+    A table of key and value pairs of the given types, sorted by key.
+    """
+    __slots__ = ('key_type', 'value_type', 'entries')
+
+    kind = 'table'
+
+
+class Signal(Node):
+    """
+    A signal subscribed to by its match and the parameters of the match,
+    along with the signal and handler functions processing it. The rule
+    is the match's rule when built from its parameters alone. A signal
+    coalescing the signals of several members instead dispatches each
+    signal to the one of its members the signal is for.
+    """
+    __slots__ = ('match', 'path', 'mparams', 'signal', 'handler', 'rule',
+                 'dispatch', 'members')
+
+
+class Function(Node):
+    """
+    A signal or handler function, its template type and its parameters.
+    """
+    __slots__ = ('name', 'type', 'params')
+
+
+class Param(Node):
+    """
+    A parameter of a signal or handler function. Depending on its kind the
+    value is a D-Bus name ('name'), the group whose generated Group object
+    is passed ('group'), or the member whose property's slot ('slot') or
+    whose interface's slots ('slots') are passed.
+    """
+    __slots__ = ('kind', 'value')
+
+
+class Fetch(Node):
+    """
+    The objects of an interface whose initial property values are read
+    in bulk from the path namespace containing them.
+    """
+    __slots__ = ('interface', 'namespace', 'paths')
+
+
+class Bucket(Node):
+    """
+    The indices of the events of a zone run by a single timer with the
+    given interval.
+    """
+    __slots__ = ('interval', 'events')
@@ -103,6 +103,15 @@ struct PropertyChanged
         }
         else
         {
+            // Use the value read along with the zone's other properties
+            auto value = zone.getPrefetchedValue(_path, _iface, _property);
+            if (value != nullptr && value->template is<T>())
+            {
+                T val = value->template get<T>();
+                _handler(zone, std::forward<T>(val));
+                return;
+            }
+
             try
             {
                 auto service = zone.getService(_path, _iface);
@@ -427,6 +436,191 @@ auto ownerSignal(const char* path,
                                std::forward<U>(handler));
 }
 
+/**
+ * @struct Path Signals
+ * @brief A match filter functor dispatching the Dbus signals of a path
+ * namespace match to the handlers of the object paths within the namespace
+ */
+struct PathSignals
+{
+    PathSignals() = delete;
+    ~PathSignals() = default;
+    PathSignals(const PathSignals&) = default;
+    PathSignals& operator=(const PathSignals&) = default;
+    PathSignals(PathSignals&&) = default;
+    PathSignals& operator=(PathSignals&&) = default;
+    PathSignals(
+        bool objectArg,
+        std::initializer_list<std::pair<const Name, Handler>> handlers) :
+        _objectArg(objectArg),
+        _handlers(handlers) { }
+
+    /** @brief Run signal handler functions
+     *
+     * Run the handlers of the object path the signal message is for, or
+     * every handler when the message is null.
+     */
+    void operator()(sdbusplus::bus::bus& bus,
+                    sdbusplus::message::message& msg,
+                    Zone& zone) const
+    {
+        dispatch(bus, msg, zone);
+    }
+
+    /** @brief Run signal handler functions
+     *
+     * Run the handlers of the object path the signal message is for, or
+     * every handler when the message is null.
+     *
+     * @return - Whether any handler was run
+     */
+    bool dispatch(sdbusplus::bus::bus& bus,
+                  sdbusplus::message::message& msg,
+                  Zone& zone) const
+    {
+        if (msg)
+        {
+            std::string path;
+            if (_objectArg)
+            {
+                sdbusplus::message::object_path op;
+                msg.read(op);
+                path = std::move(op);
+            }
+            else
+            {
+                path = msg.get_path();
+            }
+
+            auto handlers = _handlers.equal_range(path);
+            for (auto it = handlers.first; it != handlers.second; ++it)
+            {
+                // Each handler reads the message from its start
+                sd_bus_message_rewind(msg.get(), true);
+                it->second(bus, msg, zone);
+            }
+            return handlers.first != handlers.second;
+        }
+
+        for (auto& handler : _handlers)
+        {
+            handler.second(bus, msg, zone);
+        }
+        return !_handlers.empty();
+    }
+
+private:
+    bool _objectArg;
+    std::multimap<Name, Handler> _handlers;
+};
+
+/**
+ * @brief Used to process the Dbus signals of a path namespace match using
+ * the handlers of the signal's object path
+ *
+ * @param[in] handlers - The handlers of each object path
+ *
+ * @return - The PathSignals signal struct
+ */
+inline auto pathSignals(
+    std::initializer_list<std::pair<const Name, Handler>> handlers)
+{
+    return PathSignals(false, handlers);
+}
+
+/**
+ * @brief Used to process the Dbus signals of a path namespace match using
+ * the handlers of the object path given by the signal's first argument,
+ * such as the InterfacesAdded and InterfacesRemoved signals
+ *
+ * @param[in] handlers - The handlers of each object path
+ *
+ * @return - The PathSignals signal struct
+ */
+inline auto objectPathSignals(
+    std::initializer_list<std::pair<const Name, Handler>> handlers)
+{
+    return PathSignals(true, handlers);
+}
+
+/**
+ * @struct Shared Signal
+ * @brief A signal handler the zones subscribe to through a single match
+ * shared by every zone using the signal
+ */
+struct SharedSignal
+{
+    SharedSignal() = delete;
+    ~SharedSignal() = default;
+    SharedSignal(const SharedSignal&) = default;
+    SharedSignal& operator=(const SharedSignal&) = default;
+    SharedSignal(SharedSignal&&) = default;
+    SharedSignal& operator=(SharedSignal&&) = default;
+    SharedSignal(size_t id, Handler&& handler) :
+        _id(id),
+        _handler(std::move(handler)) { }
+
+    /** @brief Run signal handler function
+     *
+     * Run the handler of the shared signal for the zone.
+     */
+    void operator()(sdbusplus::bus::bus& bus,
+                    sdbusplus::message::message& msg,
+                    Zone& zone) const
+    {
+        _handler(bus, msg, zone);
+    }
+
+    /** @brief Get the generated id of the shared signal */
+    size_t id() const
+    {
+        return _id;
+    }
+
+    /** @brief Get the handler of the shared signal */
+    const Handler& handler() const
+    {
+        return _handler;
+    }
+
+private:
+    size_t _id;
+    Handler _handler;
+};
+
+/**
+ * @brief Used to process a Dbus signal subscribed to once for all of the
+ * zones using it
+ *
+ * @param[in] id - The generated id of the shared signal
+ * @param[in] handler - Handler function to perform
+ *
+ * @return - The SharedSignal signal struct
+ */
+inline auto sharedSignal(size_t id, Handler&& handler)
+{
+    return SharedSignal(id, std::move(handler));
+}
+
+/**
+ * @brief Get the dispatcher of a signal handler that dispatches the
+ * signals of a path namespace match to the handlers of its object paths
+ *
+ * @param[in] handler - The signal handler
+ *
+ * @return - The PathSignals of the handler, or nullptr when the handler
+ *           handles the signals of a single object
+ */
+inline const PathSignals* getPathSignals(const Handler& handler)
+{
+    auto shared = handler.target<SharedSignal>();
+    if (shared != nullptr)
+    {
+        return shared->handler().target<PathSignals>();
+    }
+    return handler.target<PathSignals>();
+}
+
 } // namespace control
 } // namespace fan
 } // namespace phosphor
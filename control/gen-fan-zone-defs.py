@@ -5,23 +5,182 @@ This script reads in fan definition and zone definition YAML
 files and generates a set of structures for use by the fan control code.
 """
 
+import multiprocessing
+import numbers
 import os
+import re
 import sys
-import yaml
 from argparse import ArgumentParser
-from mako.template import Template
-from mako.lookup import TemplateLookup
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                             '..'))
+from gen_utility import GeneratorLookup, load_yaml, render_if_changed, \
+    write_depfile
+from fan_zone_ir import ZoneGroup, Condition, ConditionProperty, Zone, \
+    Fan, Group, Member, Event, Precondition, PrecondAction, Timer, Action, \
+    ActionList, Literal, Table, Signal, Function, Param, Fetch, Bucket, Node
 
 
-def convertToMap(listOfDict):
+def getTableValue(cType, value, action):
     """
-    Converts a list of dictionary entries to a std::map initialization list.
+    Checks a parsed YAML scalar given as a key or value of an action's map
+    is of the given string, bool, floating point or integer type, exiting
+    when it is not. Returns the value as the python type of its C++ type.
     """
-    listOfDict = listOfDict.replace('\'', '\"')
-    listOfDict = listOfDict.replace('[', '{')
-    listOfDict = listOfDict.replace(']', '}')
-    listOfDict = listOfDict.replace(':', ',')
-    return listOfDict
+    lType = cType.lower()
+    isNumber = isinstance(value, numbers.Real) and \
+        not isinstance(value, bool)
+    if 'string' in lType:
+        if isinstance(value, (dict, list)) or value is None:
+            sys.exit("Invalid " + cType + " value " + repr(value) +
+                     " in action " + action)
+        if not isinstance(value, (str, type(u''))):
+            value = str(value)
+        return value
+    elif lType == 'bool':
+        if isinstance(value, bool):
+            return value
+    elif lType in ('double', 'float'):
+        if isNumber:
+            return float(value)
+    else:
+        if isNumber and value == int(value) and \
+           (value >= 0 or not (lType.startswith('u') or
+                               lType == 'size_t')):
+            return int(value)
+    sys.exit("Invalid " + cType + " value " + repr(value) +
+             " in action " + action)
+
+
+def getLookupTable(mapType, entries, action):
+    """
+    Parses the list of key to value entries given to an action's map
+    parameter of type std::map<key, value> into a table of the same key
+    and value types, generated as a LookupTable. The entries are validated
+    against the types and sorted by key, so the action can binary search
+    them.
+    """
+    types = re.match(r'^std::map<\s*([^,<>]+?)\s*,\s*([^,<>]+?)\s*>$',
+                     str(mapType).strip())
+    if types is None:
+        sys.exit("Unsupported map type " + str(mapType) +
+                 " in action " + action)
+    keyType, valueType = types.groups()
+    for cType in (keyType, valueType):
+        if not re.match(r'^std::string$|^bool$|^double$|^float$|'
+                        r'^u?int(8|16|32|64)_t$|^size_t$', cType.lower()):
+            sys.exit("Unsupported map type " + str(mapType) +
+                     " in action " + action)
+
+    table = {}
+    for entry in entries or []:
+        if not isinstance(entry, dict):
+            sys.exit("Invalid map entry " + repr(entry) +
+                     " in action " + action)
+        for key, value in entry.items():
+            # Keys are sorted as the C++ key type compares them
+            key = getTableValue(keyType, key, action)
+            if key in table:
+                sys.exit("Duplicate map key " + repr(key) +
+                         " in action " + action)
+            table[key] = getTableValue(valueType, value, action)
+
+    return Table(key_type=keyType, value_type=valueType,
+                 entries=[(key, table[key]) for key in sorted(table)])
+
+
+def indexByName(entries, section, errors):
+    """
+    Builds a name keyed index of the entries within a YAML section,
+    recording any duplicate names found.
+    """
+    index = {}
+    for entry in entries or []:
+        if entry['name'] in index:
+            errors.append("Duplicate " + section + " name " + entry['name'])
+            continue
+        index[entry['name']] = entry
+    return index
+
+
+def getSignal(eMatch, events_data):
+    """
+    Returns the signal used by a match, either given inline with the match
+    or referenced by name from the signals section.
+    """
+    if isinstance(eMatch['signal'], dict):
+        return eMatch['signal']
+    return events_data['signals'][eMatch['signal']]
+
+
+def checkEventRefs(e, events_data, errors):
+    """
+    Records every name referenced by an event, including any precondition
+    and its events, that is not found within its section's index.
+    """
+    def check(section, name):
+        if name not in events_data[section]:
+            errors.append("Missing " + section + " name " + str(name) +
+                          " in event " + str(e.get('name')))
+            return False
+        return True
+
+    def checkActions(eActions):
+        for a in eActions.get('actions') or []:
+            if check('actions', a['name']):
+                eAction = events_data['actions'][a['name']]
+                if 'actions' in (eAction.get('parameters') or []):
+                    checkActions(a)
+
+    def checkGroupsAndMatches(edata):
+        for g in edata.get('groups') or []:
+            check('groups', g['name'])
+        for m in edata.get('matches') or []:
+            if not check('matches', m['name']):
+                continue
+            eMatch = events_data['matches'][m['name']]
+            if not isinstance(eMatch['signal'], dict) and \
+               not check('signals', eMatch['signal']):
+                continue
+            check('handlers', getSignal(eMatch, events_data)['handler'])
+
+    if e.get('precondition') is not None:
+        pc = e['precondition']
+        check('preconditions', pc['name'])
+        checkGroupsAndMatches(pc)
+        for pce in pc.get('events') or []:
+            checkEventRefs(pce, events_data, errors)
+    else:
+        checkGroupsAndMatches(e)
+        checkActions(e)
+
+
+def indexEventsData(events_data, zone_conditions_data):
+    """
+    Replaces each named section of the events and zone conditions YAML with
+    an index keyed on the entries' names so references are resolved without
+    searching. Duplicate names and references to missing names are reported
+    together before any zone data is built.
+    """
+    errors = []
+    events_index = {}
+    for section in ['groups', 'actions', 'matches', 'signals',
+                    'handlers', 'preconditions']:
+        events_index[section] = indexByName(events_data.get(section),
+                                            section, errors)
+    if 'events' in events_data:
+        events_index['events'] = events_data['events'] or []
+        for e in events_index['events']:
+            checkEventRefs(e, events_index, errors)
+
+    conditions_index = {}
+    if zone_conditions_data:
+        conditions_index['conditions'] = indexByName(
+            zone_conditions_data.get('conditions'), 'conditions', errors)
+
+    if errors:
+        sys.exit("\n".join(errors))
+
+    return events_index, conditions_index
 
 
 def getGroups(zNum, zCond, edata, events):
@@ -46,221 +205,192 @@ def getGroups(zNum, zCond, edata, events):
                    for z in eGroups['zone_conditions']):
                 continue
 
-        eGroup = next(g for g in events['groups']
-                      if g['name'] == eGroups['name'])
+        eGroup = events['groups'][eGroups['name']]
 
-        group = {}
         members = []
-        group['name'] = eGroup['name']
         for m in eGroup['members']:
-            member = {}
-            member['path'] = eGroup['type']
-            member['object'] = (eGroup['type'] + m)
-            member['interface'] = eGroups['interface']
-            member['property'] = eGroups['property']['name']
-            member['type'] = eGroups['property']['type']
+            pType = eGroups['property']['type']
             # Add expected group member's property value if given
-            if ('value' in eGroups['property']) and \
-               (eGroups['property']['value'] is not None):
-                    if isinstance(eGroups['property']['value'], str) or \
-                            "string" in str(member['type']).lower():
-                        member['value'] = (
-                            "\"" + eGroups['property']['value'] + "\"")
-                    else:
-                        member['value'] = eGroups['property']['value']
-            members.append(member)
-        group['members'] = members
-        groups.append(group)
+            value = eGroups['property'].get('value')
+            members.append(Member(
+                path=eGroup['type'],
+                object=(eGroup['type'] + m),
+                interface=eGroups['interface'],
+                property=eGroups['property']['name'],
+                type=pType,
+                value=value,
+                string=(value is not None and
+                        (isinstance(value, str) or
+                         "string" in str(pType).lower()))))
+        groups.append(Group(name=eGroup['name'], members=members))
     return groups
 
 
-def getActions(edata, actions, events):
+def getActionParam(p, eActions, eAction, events):
+    """
+    Constructs the value of an action's parameter: the list of actions
+    given to an 'actions' parameter, the timer, the lookup table of a map,
+    or a literal of the given type, or of size_t when no type is given.
     """
-    Extracts and constructs the make_action function call for
-    all the actions within the given event.
+    value = eActions[p]
+    if type(value) is not dict:
+        if p == 'actions':
+            return ActionList(actions=getActions(eActions, events))
+        elif p == 'property':
+            sys.exit("Missing type of property parameter in action " +
+                     eAction['name'])
+        # Default type to 'size_t' when not given
+        return Literal(type='size_t', value=value, string=False)
+    elif p == 'timer':
+        return Timer(seconds=value['delay'], type=value['type'])
+    elif p == 'map':
+        return getLookupTable(value['type'], value['value'], eAction['name'])
+    return Literal(type=str(value['type']).lower(),
+                   value=value['value'],
+                   string=(isinstance(value['value'], str) or
+                           "string" in str(value['type']).lower()))
+
+
+def getActions(actions, events):
+    """
+    Extracts and constructs the actions, and their parameters, within the
+    given event or action list.
     """
     action = []
     for eActions in actions['actions']:
-        actions = {}
-        eAction = next(a for a in events['actions']
-                       if a['name'] == eActions['name'])
-        actions['name'] = eAction['name']
+        eAction = events['actions'][eActions['name']]
         params = []
         if ('parameters' in eAction) and \
            (eAction['parameters'] is not None):
             for p in eAction['parameters']:
-                param = "static_cast<"
-                if type(eActions[p]) is not dict:
-                    if p == 'actions':
-                        param = "std::vector<Action>{"
-                        pActs = getActions(edata, eActions, events)
-                        for a in pActs:
-                            if (len(a['parameters']) != 0):
-                                param += (
-                                    "make_action(action::" +
-                                    a['name'] +
-                                    "(\n")
-                                for i, ap in enumerate(a['parameters']):
-                                    if (i+1) != len(a['parameters']):
-                                        param += (ap + ",")
-                                    else:
-                                        param += (ap + ")")
-                            else:
-                                param += ("make_action(action::" + a['name'])
-                            param += "),"
-                        param += "}"
-                    elif p == 'property':
-                        if isinstance(eActions[p], str) or \
-                           "string" in str(eActions[p]['type']).lower():
-                            param += (
-                                str(eActions[p]['type']).lower() +
-                                ">(\"" + str(eActions[p]) + "\")")
-                        else:
-                            param += (
-                                str(eActions[p]['type']).lower() +
-                                ">(" + str(eActions[p]['value']).lower() + ")")
-                    else:
-                        # Default type to 'size_t' when not given
-                        param += ("size_t>(" + str(eActions[p]).lower() + ")")
-                else:
-                    if p == 'timer':
-                        param = (
-                            "Timer{static_cast<std::chrono::seconds>(" +
-                            str(eActions[p]['delay']) + "), " +
-                            "util::Timer::TimerType::" +
-                            str(eActions[p]['type']) + "}")
-                    else:
-                        param += (str(eActions[p]['type']).lower() + ">(")
-                        if p != 'map':
-                            if isinstance(eActions[p]['value'], str) or \
-                               "string" in str(eActions[p]['type']).lower():
-                                param += \
-                                    "\"" + str(eActions[p]['value']) + "\")"
-                            else:
-                                param += \
-                                    str(eActions[p]['value']).lower() + ")"
-                        else:
-                            param += (
-                                str(eActions[p]['type']).lower() +
-                                convertToMap(str(eActions[p]['value'])) + ")")
-                params.append(param)
-        actions['parameters'] = params
-        action.append(actions)
+                params.append(getActionParam(p, eActions, eAction, events))
+        action.append(Action(name=eAction['name'], params=params))
     return action
 
 
+def getSharedGroup(group, shared_groups):
+    """
+    Returns the name of the generated Group object containing the members of
+    the given group. Groups with the same members share a single generated
+    Group object, which is added the first time its members are seen.
+    """
+    if group.shared is None:
+        key = tuple(sorted((m.object, m.interface, m.property)
+                           for m in group.members))
+        if key not in shared_groups['names']:
+            name = "group" + str(len(shared_groups['groups']))
+            shared_groups['names'][key] = name
+            shared_groups['groups'].append(Group(name=name,
+                                                 members=group.members))
+        group.shared = shared_groups['names'][key]
+    return group.shared
+
+
+def getFunction(eFunc, group, member, handler=False):
+    """
+    Constructs a signal or handler function for a group member along with
+    its parameters. A 'group' parameter is the member's group, passed as
+    the group's shared Group object once the zones are built, rather than
+    repeating the group's members. The other parameters of a signal are
+    D-Bus names given by the member. Handlers keep the member's values in
+    the zones' property cache, so a handler's 'object', 'interface' and
+    'property' parameters are passed as the slot of the member's property
+    ('slot'), and its 'object' and 'interface' parameters without a
+    'property' as the slots of every property of the member's object
+    interface ('slots').
+    """
+    params = [str(p) for p in eFunc.get('parameters') or []]
+    names = [p for p in params if p not in ('type', 'group')]
+    slotKind = None
+    if handler and names:
+        if sorted(names) == ['interface', 'object', 'property']:
+            slotKind = 'slot'
+        elif sorted(names) == ['interface', 'object']:
+            slotKind = 'slots'
+        else:
+            sys.exit("Unsupported parameters " + ", ".join(names) +
+                     " of handler " + eFunc['name'] + ", handlers take "
+                     "either object, interface and property or object "
+                     "and interface")
+
+    func = Function(name=eFunc['name'], params=[])
+    for sp in params:
+        if (sp == 'type'):
+            func.type = member.type
+        elif (sp == 'group'):
+            func.params.append(Param(kind=sp, value=group))
+        elif slotKind is not None:
+            # The names are passed together as the first one's slot(s)
+            if sp == names[0]:
+                func.params.append(Param(kind=slotKind, value=member))
+        else:
+            func.params.append(Param(kind='name',
+                                     value=getattr(member, sp)))
+    return func
+
+
+def getSignals(groups, matches, events_data):
+    """
+    Constructs the signal entries, each with its match, signal and handler
+    functions and their parameters, for every member of the given groups.
+    """
+    signals = []
+    for group in groups:
+        for member in group.members:
+            for eMatches in matches:
+                eMatch = events_data['matches'][eMatches['name']]
+                params = []
+                if ('parameters' in eMatch) and \
+                   (eMatch['parameters'] is not None):
+                    for p in eMatch['parameters']:
+                        params.append(getattr(member, str(p)))
+                eSignal = getSignal(eMatch, events_data)
+                # Add signal handler
+                eHandler = events_data['handlers'][eSignal['handler']]
+                signals.append(Signal(
+                    match=eMatch['name'],
+                    path=member.object,
+                    mparams=params,
+                    signal=getFunction(eSignal, group, member),
+                    handler=getFunction(eHandler, group, member,
+                                        handler=True)))
+    return signals
+
+
+def getTimer(edata):
+    """
+    Constructs the optional repeating action call timer of an event or
+    precondition, with an interval of 0 when no timer is given.
+    """
+    seconds = 0
+    if ('timer' in edata) and \
+       (edata['timer'] is not None):
+        seconds = int(edata['timer']['interval'])
+    return Timer(seconds=seconds, type='repeating')
+
+
 def getEvent(zone_num, zone_conditions, e, events_data):
     """
     Parses the sections of an event and populates the properties
     that construct an event within the generated source.
     """
-    event = {}
-
     # Add set speed event groups
     grps = getGroups(zone_num, zone_conditions, e, events_data)
     if not grps:
         return
-    event['groups'] = grps
 
     # Add optional set speed actions and function parameters
-    event['action'] = []
+    actions = []
     if ('actions' in e) and \
        (e['actions'] is not None):
-        event['action'] = getActions(e, e, events_data)
+        actions = getActions(e, events_data)
 
-    # Add signal handlers
-    signals = []
-    for group in event['groups']:
-        for member in group['members']:
-            for eMatches in e['matches']:
-                signal = {}
-                eMatch = next(m for m in events_data['matches']
-                              if m['name'] == eMatches['name'])
-                signal['match'] = eMatch['name']
-                params = []
-                if ('parameters' in eMatch) and \
-                   (eMatch['parameters'] is not None):
-                    for p in eMatch['parameters']:
-                        params.append(member[str(p)])
-                signal['mparams'] = params
-                if ('parameters' in eMatch['signal']) and \
-                   (eMatch['signal']['parameters'] is not None):
-                    eSignal = eMatch['signal']
-                else:
-                    eSignal = next(s for s in events_data['signals']
-                                   if s['name'] == eMatch['signal'])
-                signal['signal'] = eSignal['name']
-                sparams = {}
-                if ('parameters' in eSignal) and \
-                   (eSignal['parameters'] is not None):
-                    splist = []
-                    for p in eSignal['parameters']:
-                        sp = str(p)
-                        if (sp != 'type'):
-                            splist.append(sp)
-                            if (sp != 'group'):
-                                sparams[sp] = "\"" + member[sp] + "\""
-                            else:
-                                sparams[sp] = "Group{\n"
-                                for m in group['members']:
-                                    sparams[sp] += (
-                                        "{\n" +
-                                        "\"" + str(m['object']) + "\",\n" +
-                                        "{\"" + str(m['interface']) + "\"," +
-                                        "\"" + str(m['property']) + "\"}\n" +
-                                        "},\n")
-                                sparams[sp] += "}"
-                        else:
-                            sparams[sp] = member[sp]
-                    sparams['params'] = splist
-                signal['sparams'] = sparams
-                # Add signal handler
-                eHandler = next(h for h in events_data['handlers']
-                                if h['name'] == eSignal['handler'])
-                signal['handler'] = eHandler['name']
-                hparams = {}
-                if ('parameters' in eHandler) and \
-                   (eHandler['parameters'] is not None):
-                    hplist = []
-                    for p in eHandler['parameters']:
-                        hp = str(p)
-                        if (hp != 'type'):
-                            hplist.append(hp)
-                            if (hp != 'group'):
-                                hparams[hp] = "\"" + member[hp] + "\""
-                            else:
-                                hparams[hp] = "Group{\n"
-                                for m in group['members']:
-                                    hparams[hp] += (
-                                        "{\n" +
-                                        "\"" + str(m['object']) + "\",\n" +
-                                        "{\"" + str(m['interface']) + "\"," +
-                                        "\"" + str(m['property']) + "\"}\n" +
-                                        "},\n")
-                                hparams[hp] += "}"
-                        else:
-                            hparams[hp] = member[hp]
-                    hparams['params'] = hplist
-                signal['hparams'] = hparams
-                signals.append(signal)
-    event['signals'] = signals
-
-    # Add optional action call timer
-    timer = {}
-    interval = "static_cast<std::chrono::seconds>"
-    if ('timer' in e) and \
-       (e['timer'] is not None):
-        timer['interval'] = (interval +
-                             "(" +
-                             str(e['timer']['interval']) +
-                             ")")
-    else:
-        timer['interval'] = (interval +
-                             "(" + str(0) + ")")
-    timer['type'] = "util::Timer::TimerType::repeating"
-    event['timer'] = timer
-
-    return event
+    return Event(groups=grps,
+                 actions=actions,
+                 # Add signal handlers
+                 signals=getSignals(grps, e['matches'], events_data),
+                 # Add optional action call timer
+                 timer=getTimer(e))
 
 
 def addPrecondition(zNum, zCond, event, events_data):
@@ -268,49 +398,20 @@ def addPrecondition(zNum, zCond, event, events_data):
     Parses the precondition section of an event and populates the necessary
     structures to generate a precondition for a set speed event.
     """
-    precond = {}
     # Add set speed event precondition group
     grps = getGroups(zNum, zCond, event['precondition'], events_data)
     if not grps:
         return
-    precond['pcgrps'] = grps
 
     # Add set speed event precondition actions
-    pc = []
-    pcs = {}
-    pcs['name'] = event['precondition']['name']
-    epc = next(p for p in events_data['preconditions']
-               if p['name'] == event['precondition']['name'])
+    epc = events_data['preconditions'][event['precondition']['name']]
     params = []
     for p in epc['parameters']:
-        param = {}
-        if p == 'groups':
-            param['type'] = "std::vector<PrecondGroup>"
-            param['open'] = "{"
-            param['close'] = "}"
-            values = []
-            for group in precond['pcgrps']:
-                for pcgrp in group['members']:
-                    value = {}
-                    value['value'] = (
-                        "PrecondGroup{\"" +
-                        str(pcgrp['object']) + "\",\"" +
-                        str(pcgrp['interface']) + "\",\"" +
-                        str(pcgrp['property']) + "\"," +
-                        "static_cast<" +
-                        str(pcgrp['type']).lower() + ">")
-                    if isinstance(pcgrp['value'], str) or \
-                       "string" in str(pcgrp['type']).lower():
-                        value['value'] += ("(" + str(pcgrp['value']) + ")}")
-                    else:
-                        value['value'] += \
-                            ("(" + str(pcgrp['value']).lower() + ")}")
-                    values.append(value)
-            param['values'] = values
-        params.append(param)
-    pcs['params'] = params
-    pc.append(pcs)
-    precond['pcact'] = pc
+        if p != 'groups':
+            sys.exit("Unsupported parameter " + str(p) +
+                     " of precondition " + epc['name'])
+        params.append([m for group in grps for m in group.members])
+    pc = [PrecondAction(name=event['precondition']['name'], params=params)]
 
     pcevents = []
     for pce in event['precondition']['events']:
@@ -318,125 +419,69 @@ def addPrecondition(zNum, zCond, event, events_data):
         if not pcevent:
             continue
         pcevents.append(pcevent)
-    precond['pcevts'] = pcevents
-
-    # Add precondition signal handlers
-    signals = []
-    for group in precond['pcgrps']:
-        for member in group['members']:
-            for eMatches in event['precondition']['matches']:
-                signal = {}
-                eMatch = next(m for m in events_data['matches']
-                              if m['name'] == eMatches['name'])
-                signal['match'] = eMatch['name']
-                params = []
-                if ('parameters' in eMatch) and \
-                   (eMatch['parameters'] is not None):
-                    for p in eMatch['parameters']:
-                        params.append(member[str(p)])
-                signal['mparams'] = params
-                if ('parameters' in eMatch['signal']) and \
-                   (eMatch['signal']['parameters'] is not None):
-                    eSignal = eMatch['signal']
-                else:
-                    eSignal = next(s for s in events_data['signals']
-                                   if s['name'] == eMatch['signal'])
-                signal['signal'] = eSignal['name']
-                sparams = {}
-                if ('parameters' in eSignal) and \
-                   (eSignal['parameters'] is not None):
-                    splist = []
-                    for p in eSignal['parameters']:
-                        sp = str(p)
-                        if (sp != 'type'):
-                            splist.append(sp)
-                            if (sp != 'group'):
-                                sparams[sp] = "\"" + member[sp] + "\""
-                            else:
-                                sparams[sp] = "Group{\n"
-                                for m in group:
-                                    sparams[sp] += (
-                                        "{\n" +
-                                        "\"" + str(m['object']) + "\",\n" +
-                                        "{\"" + str(m['interface']) + "\"," +
-                                        "\"" + str(m['property']) + "\"}\n" +
-                                        "},\n")
-                                sparams[sp] += "}"
-                        else:
-                            sparams[sp] = member[sp]
-                    sparams['params'] = splist
-                signal['sparams'] = sparams
-                # Add signal handler
-                eHandler = next(h for h in events_data['handlers']
-                                if h['name'] == eSignal['handler'])
-                signal['handler'] = eHandler['name']
-                hparams = {}
-                if ('parameters' in eHandler) and \
-                   (eHandler['parameters'] is not None):
-                    hplist = []
-                    for p in eHandler['parameters']:
-                        hp = str(p)
-                        if (hp != 'type'):
-                            hplist.append(hp)
-                            if (hp != 'group'):
-                                hparams[hp] = "\"" + member[hp] + "\""
-                            else:
-                                hparams[hp] = "Group{\n"
-                                for m in group:
-                                    hparams[hp] += (
-                                        "{\n" +
-                                        "\"" + str(m['object']) + "\",\n" +
-                                        "{\"" + str(m['interface']) + "\"," +
-                                        "\"" + str(m['property']) + "\"}\n" +
-                                        "},\n")
-                                hparams[hp] += "}"
-                        else:
-                            hparams[hp] = member[hp]
-                    hparams['params'] = hplist
-                signal['hparams'] = hparams
-                signals.append(signal)
-    precond['pcsigs'] = signals
-
-    # Add optional action call timer
-    timer = {}
-    interval = "static_cast<std::chrono::seconds>"
-    if ('timer' in event['precondition']) and \
-       (event['precondition']['timer'] is not None):
-        timer['interval'] = (interval +
-                             "(" +
-                             str(event['precondition']['timer']['interval']) +
-                             ")")
-    else:
-        timer['interval'] = (interval +
-                             "(" + str(0) + ")")
-    timer['type'] = "util::Timer::TimerType::repeating"
-    precond['pctime'] = timer
 
-    return precond
+    return Precondition(groups=grps,
+                        actions=pc,
+                        events=pcevents,
+                        # Add precondition signal handlers
+                        signals=getSignals(grps,
+                                           event['precondition']['matches'],
+                                           events_data),
+                        # Add optional action call timer
+                        timer=getTimer(event['precondition']))
 
 
-def getEventsInZone(zone_num, zone_conditions, events_data):
+def eventUsesZoneNumbers(e):
+    """
+    Determines whether any group of an event, or of its precondition and
+    the precondition's events, is filtered on zone numbers.
+    """
+    edata = e
+    if ('precondition' in e) and \
+       (e['precondition'] is not None):
+        edata = e['precondition']
+        if any(eventUsesZoneNumbers(pce) for pce in edata['events']):
+            return True
+    return any(z.get('zones') is not None
+               for g in edata['groups']
+               for z in g.get('zone_conditions') or [])
+
+
+def getEventsInZone(zone_num, zone_conditions, events_data, events_cache,
+                    keys=None):
     """
     Constructs the event entries defined for each zone using the events yaml
-    provided.
+    provided. Events are only constructed once for each unique set of zone
+    conditions and, when the event filters on them, zone number. Zones with
+    the same inputs share the constructed event entries from the cache.
+    When given a keys list, the cache key of each event returned is added
+    to it.
     """
     events = []
 
     if 'events' in events_data:
-        for e in events_data['events']:
-            event = {}
-            # Add precondition if given
-            if ('precondition' in e) and \
-               (e['precondition'] is not None):
-                event['pc'] = addPrecondition(zone_num,
-                                              zone_conditions,
-                                              e,
-                                              events_data)
-            else:
-                event = getEvent(zone_num, zone_conditions, e, events_data)
-                if not event:
-                    continue
+        cond_names = frozenset(c['name'] for c in zone_conditions or [])
+        for i, e in enumerate(events_data['events']):
+            key = (i,
+                   zone_num if eventUsesZoneNumbers(e) else None,
+                   cond_names)
+            if key not in events_cache:
+                # Add precondition if given
+                if ('precondition' in e) and \
+                   (e['precondition'] is not None):
+                    pc = addPrecondition(zone_num, zone_conditions, e,
+                                         events_data)
+                    event = Event(pc=pc) if pc else None
+                else:
+                    event = getEvent(zone_num, zone_conditions, e,
+                                     events_data)
+                events_cache[key] = event
+            event = events_cache[key]
+            if not event:
+                continue
             events.append(event)
+            if keys is not None:
+                keys.append(key)
 
     return events
 
@@ -464,13 +509,11 @@ def getFansInZone(zone_num, profiles, fan_data):
         if profile not in profiles:
             continue
 
-        fan = {}
-        fan['name'] = f['inventory']
-        fan['sensors'] = f['sensors']
-        fan['target_interface'] = f.get(
-            'target_interface',
-            'xyz.openbmc_project.Control.FanSpeed')
-        fans.append(fan)
+        fans.append(Fan(name=f['inventory'],
+                        sensors=f['sensors'],
+                        target_interface=f.get(
+                            'target_interface',
+                            'xyz.openbmc_project.Control.FanSpeed')))
 
     return fans
 
@@ -481,35 +524,171 @@ def getConditionInZoneConditions(zone_condition, zone_conditions_data):
     that match both the zone condition passed in.
     """
 
-    condition = {}
+    c = zone_conditions_data['conditions'].get(zone_condition)
+    if c is None:
+        return None
 
-    for c in zone_conditions_data['conditions']:
+    properties = []
+    for p in c['properties']:
+        properties.append(ConditionProperty(property=p['property'],
+                                            interface=p['interface'],
+                                            path=p['path'],
+                                            type=p['type'].lower(),
+                                            value=p['value']))
 
-        if zone_condition != c['name']:
-            continue
-        condition['type'] = c['type']
-        properties = []
-        for p in c['properties']:
-            property = {}
-            property['property'] = p['property']
-            property['interface'] = p['interface']
-            property['path'] = p['path']
-            property['type'] = p['type'].lower()
-            property['value'] = str(p['value']).lower()
-            properties.append(property)
-        condition['properties'] = properties
+    return Condition(type=c['type'], properties=properties)
+
+
+def getFetchPlan(events):
+    """
+    Groups the members of the groups used by the given events by their
+    interface, along with the path namespace containing the interface's
+    members. The zones read the services and initial property values of
+    each interface's members with a few bulk D-Bus calls on the namespace
+    rather than a call for each member.
+    """
+    paths = {}
+    interfaces = []
+
+    def addGroups(groups):
+        for group in groups:
+            for member in group.members:
+                intf = member.interface
+                if intf not in paths:
+                    paths[intf] = []
+                    interfaces.append(intf)
+                if member.object not in paths[intf]:
+                    paths[intf].append(member.object)
+
+    for event in events:
+        if event.pc is not None:
+            addGroups(event.pc.groups)
+            for pcevt in event.pc.events:
+                addGroups(pcevt.groups)
+        else:
+            addGroups(event.groups)
+
+    return [Fetch(interface=intf,
+                  namespace=getSubtreePath(paths[intf]),
+                  paths=paths[intf])
+            for intf in interfaces]
+
+
+def addFetchPlans(zone_groups):
+    """
+    Adds the fetch plan of each zone, read along with the plans of the
+    other zones of its zone group when the zones are created.
+    """
+    for zone_group in zone_groups:
+        for zone in zone_group.zones:
+            zone.fetches = getFetchPlan(zone.events)
+
+
+def getZone(z, zone_conditions, fan_data, events_data, events_cache,
+            keys=None):
+    """
+    Constructs the entry of a zone from its zone definition YAML, along
+    with the fans and set speed events within the zone. When given a keys
+    list, the events cache key of each of the zone's events is added to it.
+    """
+    # 'zone' is required
+    if ('zone' not in z) or (z['zone'] is None):
+        sys.exit("Missing fan zone number in " + zone_yaml)
+
+    # 'cooling_profiles' is optional (use 'all' instead)
+    if ('cooling_profiles' not in z) or \
+            (z['cooling_profiles'] is None):
+        profiles = ["all"]
+    else:
+        profiles = z['cooling_profiles']
+
+    fans = getFansInZone(z['zone'], profiles, fan_data)
+    events = getEventsInZone(z['zone'], zone_conditions,
+                             events_data, events_cache, keys)
+
+    if len(fans) == 0:
+        sys.exit("Didn't find any fans in zone " + str(z['zone']))
+
+    return Zone(num=z['zone'],
+                full_speed=z['full_speed'],
+                default_floor=z['default_floor'],
+                # 'increase_delay' is optional (use 0 by default)
+                increase_delay=z.setdefault('increase_delay', 0),
+                # 'decrease_interval' is optional (use 0 by default)
+                decrease_interval=z.setdefault('decrease_interval', 0),
+                fans=fans,
+                events=events,
+                fetches=[],
+                buckets=[],
+                bucketed=[])
+
+
+# The YAML data used by the processes building zones for --jobs
+zoneJobData = {}
+
+
+def initZoneJob(fan_data, events_data):
+    """
+    Sets the YAML data used by a process building zones.
+    """
+    zoneJobData['fan_data'] = fan_data
+    zoneJobData['events_data'] = events_data
+
+
+def buildZoneJob(job):
+    """
+    Builds a zone within a process building zones, returning the zone and
+    its events' cache keys, or the error building the zone.
+    """
+    z, zone_conditions = job
+    keys = []
+    try:
+        zone = getZone(z, zone_conditions, zoneJobData['fan_data'],
+                       zoneJobData['events_data'], {}, keys)
+    except SystemExit as e:
+        return None, None, e.code
+    return zone, keys, None
 
-        return condition
+
+def nameSignalGroups(zone_groups, shared_groups):
+    """
+    Names the shared Group objects of the groups given to the 'group'
+    parameters of the zones' signal and handler functions. The groups are
+    named in the order the zones' events use them, however the zones were
+    built.
+    """
+    def addSignals(signals):
+        for s in signals:
+            for func in (s.signal, s.handler):
+                for p in func.params:
+                    if p.kind == 'group':
+                        getSharedGroup(p.value, shared_groups)
+
+    for zone_group in zone_groups:
+        for zone in zone_group.zones:
+            for event in zone.events:
+                if event.pc is not None:
+                    for pcevt in event.pc.events:
+                        addSignals(pcevt.signals)
+                    addSignals(event.pc.signals)
+                else:
+                    addSignals(event.signals)
 
 
-def buildZoneData(zone_data, fan_data, events_data, zone_conditions_data):
+def buildZoneData(zone_data, fan_data, events_data, zone_conditions_data,
+                  shared_groups, jobs=1):
     """
     Combines the zone definition YAML and fan
     definition YAML to create a data structure defining
-    the fan cooling zones.
+    the fan cooling zones. With more than one job, the zones are built
+    concurrently by that many processes, giving the same zone data as
+    building them one after another.
     """
 
     zone_groups = []
+    events_cache = {}
+    conditions_cache = {}
+    zone_jobs = []
 
     for group in zone_data:
         conditions = []
@@ -521,61 +700,562 @@ def buildZoneData(zone_data, fan_data, events_data, zone_conditions_data):
                     sys.exit("No zone_conditions YAML file but " +
                              "zone_conditions used in zone YAML")
 
-                condition = getConditionInZoneConditions(c['name'],
-                                                         zone_conditions_data)
+                if c['name'] not in conditions_cache:
+                    conditions_cache[c['name']] = \
+                        getConditionInZoneConditions(c['name'],
+                                                     zone_conditions_data)
+                condition = conditions_cache[c['name']]
 
-                if not condition:
+                if condition is None:
                     sys.exit("Missing zone condition " + c['name'])
 
                 conditions.append(condition)
 
-        zone_group = {}
-        zone_group['conditions'] = conditions
+        zone_group = ZoneGroup(conditions=conditions, zones=[])
+        zone_groups.append(zone_group)
 
-        zones = []
         for z in group['zones']:
-            zone = {}
+            zone_jobs.append((zone_group, z, group['zone_conditions']))
+
+    if jobs > 1:
+        pool = multiprocessing.Pool(jobs, initZoneJob,
+                                    (fan_data, events_data))
+        try:
+            results = pool.map(buildZoneJob,
+                               [(z, zc) for zg, z, zc in zone_jobs], 1)
+        finally:
+            pool.close()
+            pool.join()
+        for (zone_group, z, zc), (zone, keys, error) in \
+                zip(zone_jobs, results):
+            if error is not None:
+                sys.exit(error)
+            # Zones with the same events share a single copy of them
+            zone.events = [events_cache.setdefault(key, event)
+                           for key, event in zip(keys, zone.events)]
+            zone_group.zones.append(zone)
+    else:
+        for zone_group, z, zc in zone_jobs:
+            zone_group.zones.append(
+                getZone(z, zc, fan_data, events_data, events_cache))
+
+    nameSignalGroups(zone_groups, shared_groups)
+
+    return zone_groups
+
+
+def shareEvent(event, shared_groups, shared_actions):
+    """
+    Names the shared Group and Action list objects used by an event,
+    adding the event's group members and actions to the shared objects
+    when a structurally identical entry has not been generated yet.
+    """
+    if event.group_name is None:
+        members = [m for g in event.groups for m in g.members]
+        event.group_name = getSharedGroup(Group(members=members),
+                                          shared_groups)
+    if event.actions_name is None:
+        key = freeze(event.actions)
+        if key not in shared_actions['names']:
+            name = "actions" + str(len(shared_actions['actions']))
+            shared_actions['names'][key] = name
+            shared_actions['actions'].append(
+                ActionList(name=name, actions=event.actions))
+        event.actions_name = shared_actions['names'][key]
+
+
+def shareZoneObjects(zone_groups, shared_groups, shared_actions):
+    """
+    Finds the structurally identical groups and action lists used by the
+    set speed events of every zone, so each is generated once as a named
+    static object that is referenced by all the events using it.
+    """
+    for zone_group in zone_groups:
+        for zone in zone_group.zones:
+            for event in zone.events:
+                if event.pc is not None:
+                    pc = event.pc
+                    if pc.group_name is None:
+                        members = [m for g in pc.groups for m in g.members]
+                        pc.group_name = getSharedGroup(
+                            Group(members=members), shared_groups)
+                    for pcevt in pc.events:
+                        shareEvent(pcevt, shared_groups, shared_actions)
+                else:
+                    shareEvent(event, shared_groups, shared_actions)
+
+
+# The matches whose per member signals can be coalesced, each with the
+# match function subscribing to every object within a path namespace and
+# how the namespace match's signals are dispatched to the member handlers:
+# by the signal's object path or by the object path of its first argument
+NAMESPACE_MATCHES = {
+    'propertiesChanged': ('propertiesChangedNamespace', 'pathSignals'),
+    'interfacesAdded': ('interfacesAddedNamespace', 'objectPathSignals'),
+    'interfacesRemoved': ('interfacesRemovedNamespace', 'objectPathSignals')
+}
+
+
+def getCommonPath(paths):
+    """
+    Returns the deepest object path that each of the given object paths
+    either is or is a descendant of.
+    """
+    common = []
+    for names in zip(*[p.split('/') for p in paths]):
+        if any(n != names[0] for n in names):
+            break
+        common.append(names[0])
+    return '/'.join(common) or '/'
+
+
+def getSubtreePath(paths):
+    """
+    Returns the deepest object path that the given object paths are all
+    descendants of. Neither mapper subtree lookups nor argument path
+    filters include the namespace's own path, so the namespace must be a
+    parent of every path.
+    """
+    namespace = getCommonPath(paths)
+    if namespace in paths:
+        namespace = namespace.rsplit('/', 1)[0]
+    return namespace or '/'
+
+
+def getPathNamespace(paths):
+    """
+    Returns the deepest object path that the given object paths are all
+    descendants of, or None when they only share the root path.
+    """
+    namespace = getSubtreePath(paths)
+    if namespace == '/':
+        return None
+    return namespace
+
+
+def coalesceSignals(signals):
+    """
+    Replaces the signals of members sharing a match and interface, that
+    would each subscribe to the object path of their member, by a single
+    signal subscribing to the namespace containing all of the members'
+    paths. The coalesced signal runs the handler of the member whose
+    path the signal was received for.
+    """
+    sigs = {}
+    for s in signals:
+        if s.match in NAMESPACE_MATCHES and \
+           s.mparams and s.mparams[0] == s.path:
+            key = (s.match, tuple(s.mparams[1:]))
+            sigs.setdefault(key, []).append(s)
+
+    coalesced = []
+    for s in signals:
+        if s.match not in NAMESPACE_MATCHES or \
+           s.members is not None or not s.mparams or \
+           s.mparams[0] != s.path:
+            coalesced.append(s)
+            continue
+        key = (s.match, tuple(s.mparams[1:]))
+        members = sigs[key]
+        if not members:
+            # Already added with the key's first member
+            continue
+        namespace = None
+        if len(members) > 1:
+            namespace = getPathNamespace([m.path for m in members])
+        if not namespace:
+            coalesced.append(s)
+            continue
+        match, dispatch = NAMESPACE_MATCHES[s.match]
+        coalesced.append(Signal(match=match,
+                                mparams=[namespace] + list(key[1]),
+                                dispatch=dispatch,
+                                members=members))
+        sigs[key] = []
+    return coalesced
 
-            # 'zone' is required
-            if ('zone' not in z) or (z['zone'] is None):
-                sys.exit("Missing fan zone number in " + zone_yaml)
 
-            zone['num'] = z['zone']
+def coalesceZoneSignals(zone_groups):
+    """
+    Coalesces the signals of every set speed event and precondition, each
+    event shared by multiple zones being coalesced once.
+    """
+    def coalesce(event):
+        if not event.coalesced:
+            event.signals = coalesceSignals(event.signals)
+            event.coalesced = True
+
+    for zone_group in zone_groups:
+        for zone in zone_group.zones:
+            for event in zone.events:
+                if event.pc is not None:
+                    coalesce(event.pc)
+                    for pcevt in event.pc.events:
+                        coalesce(pcevt)
+                else:
+                    coalesce(event)
+
+
+# The rules of the matches built from the generated D-Bus names alone,
+# each generated as a literal rather than built at runtime from the
+# match's parameters
+MATCH_RULES = {
+    'propertiesChanged':
+        "type='signal',path='{0}',member='PropertiesChanged',"
+        "interface='org.freedesktop.DBus.Properties',arg0='{1}',",
+    'interfacesAdded':
+        "type='signal',interface='org.freedesktop.DBus.ObjectManager',"
+        "member='InterfacesAdded',arg0path='{0}',",
+    'interfacesRemoved':
+        "type='signal',interface='org.freedesktop.DBus.ObjectManager',"
+        "member='InterfacesRemoved',arg0path='{0}',",
+    'propertiesChangedNamespace':
+        "type='signal',path_namespace='{0}',member='PropertiesChanged',"
+        "interface='org.freedesktop.DBus.Properties',arg0='{1}',",
+    'interfacesAddedNamespace':
+        "type='signal',interface='org.freedesktop.DBus.ObjectManager',"
+        "member='InterfacesAdded',arg0path='{0}/',",
+    'interfacesRemovedNamespace':
+        "type='signal',interface='org.freedesktop.DBus.ObjectManager',"
+        "member='InterfacesRemoved',arg0path='{0}/',"
+}
+
+
+def addMatchRules(zone_groups):
+    """
+    Completes the matches of every signal. Matches with a rule built from
+    their parameters alone are given the rule as a literal. The services
+    of nameOwnerChanged members are resolved at runtime by each zone, once
+    for each interface within the path namespace holding all of the
+    interface's members, so the namespace is added to the match's
+    parameters.
+    """
+    signals = []
+    for zone_group in zone_groups:
+        for zone in zone_group.zones:
+            for event in zone.events:
+                if event.pc is not None:
+                    signals.extend(event.pc.signals)
+                    for pcevt in event.pc.events:
+                        signals.extend(pcevt.signals)
+                else:
+                    signals.extend(event.signals)
 
-            zone['full_speed'] = z['full_speed']
+    owners = {}
+    for s in signals:
+        if s.match == 'nameOwnerChanged' and len(s.mparams) == 2:
+            owners.setdefault(s.mparams[1], []).append(s.mparams[0])
 
-            zone['default_floor'] = z['default_floor']
+    for s in signals:
+        rule = MATCH_RULES.get(s.match)
+        # Matches given other parameters are left to their match function
+        if rule and rule.count('{') == len(s.mparams):
+            s.rule = rule.format(*s.mparams)
+        elif s.match == 'nameOwnerChanged' and len(s.mparams) == 2:
+            s.mparams.append(getSubtreePath(owners[s.mparams[1]]))
 
-            # 'increase_delay' is optional (use 0 by default)
-            key = 'increase_delay'
-            zone[key] = z.setdefault(key, 0)
 
-            # 'decrease_interval' is optional (use 0 by default)
-            key = 'decrease_interval'
-            zone[key] = z.setdefault(key, 0)
+def freeze(value):
+    """
+    Converts the nodes, lists and dicts of parsed values to tuples that
+    compare and hash by the values they contain.
+    """
+    if isinstance(value, Node):
+        return (type(value).__name__,) + \
+            tuple(freeze(v) for v in value.fields())
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
 
-            # 'cooling_profiles' is optional (use 'all' instead)
-            if ('cooling_profiles' not in z) or \
-                    (z['cooling_profiles'] is None):
-                profiles = ["all"]
+def shareZoneSubscriptions(zone_groups):
+    """
+    Finds the set speed events whose groups and signals are identical
+    across multiple zones of a zone group, giving each of their signals an
+    id. The zones subscribe to the signal by its id, so the signal's match
+    is added once by the manager for all of the zones. Events of
+    preconditions are added and removed by each zone and are not shared.
+    """
+    ids = {}
+    count = 0
+    for zone_group in zone_groups:
+        uses = {}
+        for zone in zone_group.zones:
+            for event in zone.events:
+                if event.signals is not None:
+                    event.key = freeze([event.groups, event.signals])
+                    uses[event.key] = uses.get(event.key, 0) + 1
+        for zone in zone_group.zones:
+            for event in zone.events:
+                if event.signals is None or uses[event.key] < 2:
+                    continue
+                if event.key not in ids:
+                    ids[event.key] = list(
+                        range(count, count + len(event.signals)))
+                    count += len(event.signals)
+                event.shared_ids = ids[event.key]
+
+
+def addTimerBuckets(zone_groups):
+    """
+    Groups the set speed events of each zone by their timer's interval.
+    The events sharing an interval are run by a single timer of the zone
+    rather than a timer each, so they expire together in one wakeup. The
+    events added and removed by preconditions keep their own timers.
+    """
+    for zone_group in zone_groups:
+        for zone in zone_group.zones:
+            buckets = {}
+            intervals = []
+            for i, event in enumerate(zone.events):
+                if event.pc is not None:
+                    timer = event.pc.timer
+                else:
+                    timer = event.timer
+                if timer.seconds == 0:
+                    continue
+                if timer.seconds not in buckets:
+                    buckets[timer.seconds] = []
+                    intervals.append(timer.seconds)
+                buckets[timer.seconds].append(i)
+            zone.buckets = [Bucket(interval=seconds,
+                                   events=buckets[seconds])
+                            for seconds in intervals
+                            if len(buckets[seconds]) > 1]
+            zone.bucketed = [i for bucket in zone.buckets
+                             for i in bucket.events]
+
+
+def getStringTable(conditions, zones):
+    """
+    Builds the table of the D-Bus object paths, interfaces and property
+    names used by the given zone group conditions and zones. Each name is
+    generated once within the table, with the generated definitions
+    referring to the table's entry rather than each holding a copy. The
+    lookup tables given to the zones' actions are likewise each generated
+    once as a static array.
+    """
+    table = {'index': {}, 'names': [], 'lookup': {}, 'tables': []}
+
+    def add(name):
+        if name not in table['index']:
+            table['index'][name] = len(table['names'])
+            table['names'].append(name)
+
+    def addActions(actions):
+        for a in actions:
+            for p in a.params:
+                if p.kind == 'actions':
+                    addActions(p.actions)
+                elif p.kind == 'table' and p.entries:
+                    key = freeze(p)
+                    if key not in table['lookup']:
+                        table['lookup'][key] = len(table['tables'])
+                        table['tables'].append(p)
+
+    def addMembers(members):
+        for member in members:
+            add(member.object)
+            add(member.interface)
+            add(member.property)
+
+    def addGroups(groups):
+        for group in groups:
+            addMembers(group.members)
+
+    def addSignals(signals):
+        for s in signals:
+            if s.rule is None:
+                for mp in s.mparams:
+                    add(mp)
+            if s.members is not None:
+                addSignals(s.members)
+                continue
+            for func in (s.signal, s.handler):
+                for p in func.params:
+                    if p.kind == 'name':
+                        add(p.value)
+
+    def addEvent(event):
+        addGroups(event.groups)
+        addSignals(event.signals)
+        addActions(event.actions)
+
+    for condition in conditions:
+        for property in condition.properties:
+            add(property.property)
+            add(property.interface)
+            add(property.path)
+
+    for zone in zones:
+        for event in zone.events:
+            if event.pc is not None:
+                addGroups(event.pc.groups)
+                for a in event.pc.actions:
+                    for p in a.params:
+                        addMembers(p)
+                for pcevt in event.pc.events:
+                    addEvent(pcevt)
+                addSignals(event.pc.signals)
             else:
-                profiles = z['cooling_profiles']
+                addEvent(event)
 
-            fans = getFansInZone(z['zone'], profiles, fan_data)
-            events = getEventsInZone(z['zone'], group['zone_conditions'],
-                                     events_data)
+        for fetch in zone.fetches:
+            add(fetch.interface)
+            add(fetch.namespace)
+            for path in fetch.paths:
+                add(path)
 
-            if len(fans) == 0:
-                sys.exit("Didn't find any fans in zone " + str(zone['num']))
+    return table
 
-            zone['fans'] = fans
-            zone['events'] = events
-            zones.append(zone)
 
-        zone_group['zones'] = zones
-        zone_groups.append(zone_group)
+def getSlotTable(zone_groups):
+    """
+    Builds the table of the object, interface and property triples whose
+    values are kept by the zones, giving each triple a dense slot index.
+    The slots are numbered across every zone since groups, and the handlers
+    setting their members' values, are shared between zones.
+    """
+    table = {'index': {}, 'interfaces': {}}
+
+    def addGroups(groups):
+        for group in groups:
+            for member in group.members:
+                triple = (member.object, member.interface, member.property)
+                if triple not in table['index']:
+                    table['index'][triple] = len(table['index'])
+                    table['interfaces'].setdefault(triple[:2], []).append(
+                        table['index'][triple])
+
+    for zone_group in zone_groups:
+        for zone in zone_group.zones:
+            for event in zone.events:
+                if event.pc is not None:
+                    # The precondition's values are its groups' members
+                    addGroups(event.pc.groups)
+                    for pcevt in event.pc.events:
+                        addGroups(pcevt.groups)
+                else:
+                    addGroups(event.groups)
 
-    return zone_groups
+    return table
+
+
+class SlotRef(object):
+    """
+    Called by the templates to look up the property cache slot of a
+    member's property, or the slots of a member's interface, given by
+    the slot table of the definitions being rendered.
+    """
+    def __init__(self, table):
+        self.table = table
+
+    def index(self, member):
+        return self.table['index'][(member.object,
+                                    member.interface,
+                                    member.property)]
+
+    def interface(self, member):
+        return self.table['interfaces'][(member.object,
+                                         member.interface)]
+
+
+class NameRef(object):
+    """
+    Called by the templates to look up a D-Bus name's entry in the string
+    table generated for the definitions being rendered, which the templates
+    select with use() where they generate the table.
+    """
+    def __init__(self):
+        self.table = None
+
+    def use(self, table):
+        self.table = table
+        return ''
+
+    def index(self, name):
+        return self.table['index'][name]
+
+    def lookup(self, table):
+        return self.table['lookup'][freeze(table)]
+
+
+def splitZoneUnits(zone_groups, sources):
+    """
+    Divides the zones of each zone group into units, each adding its zones
+    to the zone layouts with a function generated for the unit. Zones of
+    different zone groups never share a unit. When generating the zones
+    across a number of sources, every unit holds at most an equal share of
+    all the zones, and the units are spread across the sources so each
+    holds about as many zones. Returns the units along with the units of
+    each source.
+    """
+    size = None
+    if sources:
+        total = sum(len(zone_group.zones) for zone_group in zone_groups)
+        size = max(1, -(-total // sources))
+
+    units = []
+    for zone_group in zone_groups:
+        zones = zone_group.zones
+        step = size or len(zones) or 1
+        zone_group.units = []
+        for i in range(0, len(zones), step):
+            unit = {'num': len(units), 'zones': zones[i:i + step]}
+            units.append(unit)
+            zone_group.units.append(unit)
+
+    unit_sources = [[] for _ in range(sources or 0)]
+    if unit_sources:
+        # Largest units first, each to the source holding the fewest zones
+        for unit in sorted(units, key=lambda u: -len(u['zones'])):
+            source = min(unit_sources,
+                         key=lambda s: sum(len(u['zones']) for u in s))
+            source.append(unit)
+        for source in unit_sources:
+            source.sort(key=lambda u: u['num'])
+
+    return units, unit_sources
+
+
+def addUnitObjects(unit, shared_groups, shared_actions):
+    """
+    Adds the shared groups and action lists referenced by the zones of a
+    unit to the unit, which must define them for itself.
+    """
+    names = set()
+
+    def addSignals(signals):
+        for s in signals:
+            if s.members is not None:
+                addSignals(s.members)
+                continue
+            for func in (s.signal, s.handler):
+                for p in func.params:
+                    if p.kind == 'group':
+                        names.add(p.value.shared)
+
+    def addEvent(event):
+        names.add(event.group_name)
+        names.add(event.actions_name)
+        addSignals(event.signals)
+
+    for zone in unit['zones']:
+        for event in zone.events:
+            if event.pc is not None:
+                names.add(event.pc.group_name)
+                addSignals(event.pc.signals)
+                for pcevt in event.pc.events:
+                    addEvent(pcevt)
+            else:
+                addEvent(event)
+
+    unit['groups'] = [g for g in shared_groups['groups']
+                      if g.name in names]
+    unit['actions'] = [a for a in shared_actions['actions']
+                       if a.name in names]
 
 
 if __name__ == '__main__':
@@ -596,30 +1276,110 @@ if __name__ == '__main__':
     parser.add_argument('-o', '--output_dir', dest='output_dir',
                         default=".",
                         help='output directory')
+    parser.add_argument('-d', '--depfile', dest='depfile',
+                        help='make dependency file to write listing the '
+                             'yaml and template files used')
+    parser.add_argument('-T', '--depfile_target', dest='depfile_target',
+                        help='make target the dependency file names '
+                             '(default: the generated sources)')
+    parser.add_argument('-t', '--template_cache', dest='template_cache',
+                        help='directory caching compiled templates between '
+                             'runs (default: $PHOSPHOR_FAN_TEMPLATE_CACHE)')
+    parser.add_argument('-y', '--yaml_cache', dest='yaml_cache',
+                        help='directory caching parsed yaml between runs '
+                             '(default: $PHOSPHOR_FAN_YAML_CACHE)')
+    parser.add_argument('-s', '--share_objects', dest='share_objects',
+                        action='store_true',
+                        help='generate identical groups and action lists '
+                             'once as shared static objects')
+    parser.add_argument('-k', '--const_layouts', dest='const_layouts',
+                        action='store_true',
+                        help='generate the zone layouts as constant '
+                             'tables, constructing the zones of the zone '
+                             'group used only')
+    parser.add_argument('-p', '--sources', dest='sources', type=int,
+                        help='generate the zones across this many more '
+                             'source files, fan_zone_defs_<n>.cpp, so '
+                             'they can be compiled in parallel')
+    parser.add_argument('-m', '--coalesce_matches',
+                        dest='coalesce_matches', action='store_true',
+                        help='subscribe to the signals of group members '
+                             'sharing an interface with a single match '
+                             'on their common object path namespace')
+    parser.add_argument('-j', '--jobs', dest='jobs', type=int, default=1,
+                        help='number of processes building the zones '
+                             'concurrently, or 0 for one per CPU')
+    parser.add_argument('-b', '--timer_buckets', dest='timer_buckets',
+                        action='store_true',
+                        help='run the events of a zone sharing a timer '
+                             'interval from a single timer')
+    parser.add_argument('-r', '--prefetch', dest='prefetch',
+                        action='store_true',
+                        help='read the initial property values of the '
+                             'zones\' events in bulk from a fetch plan '
+                             'generated for each zone')
+    parser.add_argument('-u', '--share_subscriptions',
+                        dest='share_subscriptions', action='store_true',
+                        help='subscribe to the signals of events identical '
+                             'across zones once for all of the zones')
     args = parser.parse_args()
 
     if not args.zone_yaml or not args.fan_yaml:
         parser.print_usage()
         sys.exit(-1)
 
-    with open(args.zone_yaml, 'r') as zone_input:
-        zone_data = yaml.safe_load(zone_input) or {}
+    if args.sources is not None and args.sources < 1:
+        sys.exit("Sources must be at least 1")
+
+    if args.jobs < 0:
+        sys.exit("Jobs must be at least 0")
+    if args.jobs == 0:
+        args.jobs = multiprocessing.cpu_count()
 
-    with open(args.fan_yaml, 'r') as fan_input:
-        fan_data = yaml.safe_load(fan_input) or {}
+    zone_data = load_yaml(args.zone_yaml, args.yaml_cache) or {}
+
+    fan_data = load_yaml(args.fan_yaml, args.yaml_cache) or {}
 
     events_data = {}
     if args.events_yaml:
-        with open(args.events_yaml, 'r') as events_input:
-            events_data = yaml.safe_load(events_input) or {}
+        events_data = load_yaml(args.events_yaml, args.yaml_cache) or {}
 
     zone_conditions_data = {}
     if args.zone_conditions_yaml:
-        with open(args.zone_conditions_yaml, 'r') as zone_conditions_input:
-            zone_conditions_data = yaml.safe_load(zone_conditions_input) or {}
+        zone_conditions_data = load_yaml(args.zone_conditions_yaml,
+                                         args.yaml_cache) or {}
+
+    events_data, zone_conditions_data = indexEventsData(events_data,
+                                                        zone_conditions_data)
 
+    # Groups referenced by signal and handler parameters, along with the
+    # set speed event groups when generating shared objects
+    shared_groups = {'names': {}, 'groups': []}
     zone_config = buildZoneData(zone_data.get('zone_configuration', {}),
-                                fan_data, events_data, zone_conditions_data)
+                                fan_data, events_data, zone_conditions_data,
+                                shared_groups, args.jobs)
+
+    # Property cache slots of the triples used by the zones
+    slots = getSlotTable(zone_config)
+
+    if args.coalesce_matches:
+        coalesceZoneSignals(zone_config)
+
+    addMatchRules(zone_config)
+
+    if args.prefetch:
+        addFetchPlans(zone_config)
+
+    if args.timer_buckets:
+        addTimerBuckets(zone_config)
+
+    if args.share_subscriptions:
+        shareZoneSubscriptions(zone_config)
+
+    # Action lists shared by set speed events
+    shared_actions = {'names': {}, 'actions': []}
+    if args.share_objects:
+        shareZoneObjects(zone_config, shared_groups, shared_actions)
 
     manager_config = zone_data.get('manager_configuration', {})
 
@@ -631,13 +1391,66 @@ if __name__ == '__main__':
         "templates")
     output_file = os.path.join(args.output_dir, "fan_zone_defs.cpp")
     if sys.version_info < (3, 0):
-        lkup = TemplateLookup(
+        lkup = GeneratorLookup(
             directories=tmpls_dir.split(),
+            cache_dir=args.template_cache,
             disable_unicode=True)
     else:
-        lkup = TemplateLookup(
-            directories=tmpls_dir.split())
-    tmpl = lkup.get_template('fan_zone_defs.mako.cpp')
-    with open(output_file, 'w') as output:
-        output.write(tmpl.render(zones=zone_config,
-                                 mgr_data=manager_config))
+        lkup = GeneratorLookup(
+            directories=tmpls_dir.split(),
+            cache_dir=args.template_cache)
+    # Only replace the outputs when the generated source changes so
+    # unchanged definitions do not trigger a rebuild
+    outputs = [output_file]
+    if args.sources or args.const_layouts:
+        # Each unit's zones are added to the zone layouts by a function
+        # generated for the unit, compiled in its own source when given
+        units, unit_sources = splitZoneUnits(zone_config, args.sources)
+        for unit in units:
+            addUnitObjects(unit, shared_groups, shared_actions)
+            unit['strings'] = getStringTable([], unit['zones'])
+        if unit_sources:
+            unit_tmpl = lkup.get_template('fan_zone_defs_unit.mako.cpp')
+        for num, source in enumerate(unit_sources):
+            unit_file = os.path.join(
+                args.output_dir, "fan_zone_defs_" + str(num) + ".cpp")
+            outputs.append(unit_file)
+            render_if_changed(unit_file, unit_tmpl,
+                              units=source,
+                              name=NameRef(),
+                              slot=SlotRef(slots))
+        if args.const_layouts:
+            tmpl = lkup.get_template('fan_zone_const_layouts.mako.cpp')
+        else:
+            tmpl = lkup.get_template('fan_zone_layouts.mako.cpp')
+        conditions = [c for zone_group in zone_config
+                      for c in zone_group.conditions]
+        render_if_changed(output_file, tmpl,
+                          zones=zone_config,
+                          units=units,
+                          unit_sources=bool(unit_sources),
+                          strings=getStringTable(conditions, []),
+                          name=NameRef(),
+                          slot=SlotRef(slots),
+                          mgr_data=manager_config)
+    else:
+        tmpl = lkup.get_template('fan_zone_defs.mako.cpp')
+        conditions = [c for zone_group in zone_config
+                      for c in zone_group.conditions]
+        zones = [z for zone_group in zone_config
+                 for z in zone_group.zones]
+        render_if_changed(output_file, tmpl,
+                          zones=zone_config,
+                          groups=shared_groups['groups'],
+                          actions=shared_actions['actions'],
+                          strings=getStringTable(conditions, zones),
+                          name=NameRef(),
+                          slot=SlotRef(slots),
+                          mgr_data=manager_config)
+
+    if args.depfile:
+        inputs = [f for f in [args.zone_yaml, args.fan_yaml,
+                              args.events_yaml, args.zone_conditions_yaml]
+                  if f]
+        write_depfile(args.depfile, args.depfile_target or outputs,
+                      inputs + sorted(lkup.dependencies))
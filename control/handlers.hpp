@@ -11,22 +11,20 @@ namespace handler
 
 /**
  * @brief A handler function to set/update a property
- * @details Sets or updates a property's value determined by a combination of
- * an object's path and property names
+ * @details Sets or updates a property's value kept in the zone's property
+ * cache slot given to an object's property by the generated definitions
  *
- * @param[in] path - Object's path name
- * @param[in] interface - Object's interface name
- * @param[in] property - Object's property name
+ * @param[in] slot - Property cache slot of the object's property
  *
  * @return Lambda function
  *     A lambda function to set/update the property value
  */
 template <typename T>
-auto setProperty(const char* path, const char* interface, const char* property)
+auto setProperty(size_t slot)
 {
     return [=](auto& zone, T&& arg)
     {
-        zone.setPropertyValue(path, interface, property, std::forward<T>(arg));
+        zone.setPropertyValue(slot, std::forward<T>(arg));
     };
 }
 
@@ -35,14 +33,15 @@ auto setProperty(const char* path, const char* interface, const char* property)
  * @details Sets or updates service name owner state used by a group where
  * a service name without an owner represents the service no longer exists
  *
- * @param[in] group - Group associated with a service
+ * @param[in] group - Group associated with a service, which must outlive
+ *                    the handler (generated groups are static objects)
  *
  * @return Lambda function
  *     A lambda function to set/update the service name owner state
  */
-auto setService(Group&& group)
+inline auto setService(const Group& group)
 {
-    return [group = std::move(group)](auto& zone, auto& name, bool hasOwner)
+    return [&group](auto& zone, auto& name, bool hasOwner)
     {
         // Update service name owner state list of a group
         zone.setServiceOwner(&group, name, hasOwner);
@@ -54,17 +53,17 @@ auto setService(Group&& group)
  * @details Removes an interface from an object's path which includes removing
  * all properties that would be under that interface
  *
- * @param[in] path - Object's path name
- * @param[in] interface - Object's interface name
+ * @param[in] slots - Property cache slots of the properties under the
+ *                    object's interface
  *
  * @return Lambda function
  *     A lambda function to remove the interface
  */
-auto removeInterface(const char* path, const char* interface)
+inline auto removeInterface(std::vector<size_t>&& slots)
 {
-    return[=](auto& zone)
+    return[slots = std::move(slots)](auto& zone)
     {
-        zone.removeObjectInterface(path, interface);
+        zone.removeObjectInterface(slots);
     };
 }
 
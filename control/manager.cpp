@@ -55,7 +55,7 @@ bool checkCondition(sdbusplus::bus::bus& bus, const auto& c)
         auto value = std::get<propertyValuePos>(p);
 
         // TODO openbmc/openbmc#1769: Support more types than just getProperty.
-        if (type.compare("getProperty") == 0)
+        if (type == std::string("getProperty"))
         {
             auto propertyValue = util::SDBusPlus::getProperty<decltype(value)>(
                     bus,
@@ -77,31 +77,65 @@ bool checkCondition(sdbusplus::bus::bus& bus, const auto& c)
 Manager::Manager(sdbusplus::bus::bus& bus,
                  phosphor::fan::event::EventPtr& events,
                  Mode mode) :
-    _bus(bus)
+    _bus(bus),
+    _subscriptions(bus)
 {
     //Create the appropriate Zone objects based on the
     //actual system configuration.
 
-    //Find the 1 ZoneGroup that meets all of its conditions
-    for (auto& group : _zoneLayouts)
+    auto conditionsMet = [&bus](const auto& group)
     {
         auto& conditions = std::get<conditionListPos>(group);
 
-        if (std::all_of(conditions.begin(), conditions.end(),
-                        [&bus](const auto& condition)
+        return std::all_of(conditions.begin(), conditions.end(),
+                           [&bus](const auto& condition)
         {
             return checkCondition(bus, condition);
-        }))
-        {
-            //Create a Zone object for each zone in this group
-            auto& zones = std::get<zoneListPos>(group);
+        });
+    };
 
+    auto createZones = [this, mode, &events](const auto& zones)
+    {
+        //Read the objects of every zone's fetch plan at once, for
+        //the zones to initialize their events from
+        PropertyPrefetch prefetch(_bus);
+        if (mode != Mode::init)
+        {
             for (auto& z : zones)
             {
-                _zones.emplace(std::get<zoneNumPos>(z),
-                               std::make_unique<Zone>(mode, _bus, events, z));
+                prefetch.add(std::get<fetchPlanPos>(z));
             }
+            prefetch.fetch();
+        }
+
+        //Create a Zone object for each zone in this group
+        for (auto& z : zones)
+        {
+            _zones.emplace(std::get<zoneNumPos>(z),
+                           std::make_unique<Zone>(mode, _bus, events, z,
+                                                  &_subscriptions,
+                                                  &prefetch));
+        }
+    };
 
+    //Find the 1 ZoneGroup that meets all of its conditions
+    for (auto& group : _zoneLayouts)
+    {
+        if (conditionsMet(group))
+        {
+            createZones(std::get<zoneListPos>(group));
+            return;
+        }
+    }
+
+    //Layouts generated as constant tables only construct the zone
+    //definitions of the one ZoneGroup used
+    for (auto& group : _constZoneLayouts)
+    {
+        if (conditionsMet(group))
+        {
+            _zoneDefinitions = std::get<zoneListPos>(group)();
+            createZones(_zoneDefinitions);
             break;
         }
     }
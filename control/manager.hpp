@@ -57,17 +57,36 @@ class Manager
          */
         sdbusplus::bus::bus& _bus;
 
+        /**
+         * The zone definitions constructed from the constant
+         * tables, which the zones refer to
+         */
+        std::vector<ZoneDefinition> _zoneDefinitions;
+
         /**
          * The fan zones in the system
          */
         ZoneMap _zones;
 
+        /**
+         * The signal matches shared by the zones, removed
+         * before the zones subscribed to them
+         */
+        SignalSubscriptions _subscriptions;
+
         /**
          * The fan zone layout for the system.
          * This is generated data.
          */
         static const std::vector<ZoneGroup> _zoneLayouts;
 
+        /**
+         * The fan zone layout for the system when generated
+         * as constant tables, otherwise empty.
+         * This is generated data.
+         */
+        static const ConstArray<ConstZoneGroup> _constZoneLayouts;
+
         /**
          * The number of seconds to delay after
          * fans get set to high speed on a power on
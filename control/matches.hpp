@@ -2,6 +2,7 @@
 
 #include <sdbusplus/bus.hpp>
 #include "sdbusplus.hpp"
+#include "zone.hpp"
 
 namespace phosphor
 {
@@ -58,6 +59,60 @@ inline auto interfacesRemoved(const std::string& obj)
     return rules::interfacesRemoved(obj);
 }
 
+/**
+ * @brief A match function that constructs a PropertiesChanged match string
+ * for a path namespace
+ * @details Constructs a PropertiesChanged match string with a given
+ * interface for every object path within a given path namespace, the
+ * namespace's objects sharing the single match
+ *
+ * @param[in] ns - Object path namespace
+ * @param[in] iface - Interface name
+ *
+ * @return - A PropertiesChanged match string
+ */
+inline auto propertiesChangedNamespace(const std::string& ns,
+                                       const std::string& iface)
+{
+    return rules::type::signal() +
+           rules::path_namespace(ns) +
+           rules::member("PropertiesChanged") +
+           rules::interface("org.freedesktop.DBus.Properties") +
+           rules::argN(0, iface);
+}
+
+/**
+ * @brief A match function that constructs an InterfacesAdded match string
+ * for a path namespace
+ * @details Constructs an InterfacesAdded match string for every object path
+ * within a given path namespace, the namespace's objects sharing the single
+ * match
+ *
+ * @param[in] ns - Object path namespace
+ *
+ * @return - An InterfacesAdded match string
+ */
+inline auto interfacesAddedNamespace(const std::string& ns)
+{
+    return rules::interfacesAdded() + rules::argNpath(0, ns + "/");
+}
+
+/**
+ * @brief A match function that constructs an InterfacesRemoved match string
+ * for a path namespace
+ * @details Constructs an InterfacesRemoved match string for every object
+ * path within a given path namespace, the namespace's objects sharing the
+ * single match
+ *
+ * @param[in] ns - Object path namespace
+ *
+ * @return - An InterfacesRemoved match string
+ */
+inline auto interfacesRemovedNamespace(const std::string& ns)
+{
+    return rules::interfacesRemoved() + rules::argNpath(0, ns + "/");
+}
+
 /**
  * @brief A match function that constructs a NameOwnerChanged match string
  * @details Constructs a NameOwnerChanged match string with a given object
@@ -82,6 +137,36 @@ inline auto nameOwnerChanged(const std::string& obj, const std::string& iface)
     return noc;
 }
 
+/**
+ * @brief A match function that constructs a NameOwnerChanged match string
+ * @details Constructs a NameOwnerChanged match string with a given object
+ * path and interface, whose service is looked up by the zone along with
+ * those of the other objects with the interface within a given path
+ * namespace, the services of the namespace being cached by the zone
+ *
+ * @param[in] obj - Object's path name
+ * @param[in] iface - Interface name
+ * @param[in] ns - Object path namespace containing the object
+ *
+ * @return - A function building the NameOwnerChanged match string for
+ * a zone
+ */
+inline Match::Builder nameOwnerChanged(const std::string& obj,
+                                       const std::string& iface,
+                                       const std::string& ns)
+{
+    return [obj, iface, ns](Zone& zone)
+    {
+        std::string noc;
+        auto& service = zone.getNamespaceService(obj, iface, ns);
+        if (!service.empty())
+        {
+            noc = rules::nameOwnerChanged(service);
+        }
+        return noc;
+    };
+}
+
 } // namespace match
 } // namespace control
 } // namespace fan
@@ -30,8 +30,8 @@ using namespace phosphor::logging;
  *     A lambda function to compare precondition property value states
  *     and either subscribe or unsubscribe a set speed event group.
  */
-auto property_states_match(std::vector<PrecondGroup>&& pg,
-                           std::vector<SetSpeedEvent>&& sse)
+inline auto property_states_match(std::vector<PrecondGroup>&& pg,
+                                  std::vector<SetSpeedEvent>&& sse)
 {
     return [pg = std::move(pg),
             sse = std::move(sse)](auto& zone, auto& group)
@@ -45,9 +45,7 @@ auto property_states_match(std::vector<PrecondGroup>&& pg,
                 try
                 {
                     return zone.getPropValueVariant(
-                        std::get<pcPathPos>(entry),
-                        std::get<pcIntfPos>(entry),
-                        std::get<pcPropPos>(entry)) ==
+                        std::get<pcSlotPos>(entry)) ==
                                 std::get<pcValuePos>(entry);
                 }
                 catch (const std::out_of_range& oore)
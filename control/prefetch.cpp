@@ -0,0 +1,203 @@
+/**
+ * Copyright © 2017 IBM Corporation
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+#include <phosphor-logging/elog-errors.hpp>
+#include <xyz/openbmc_project/Common/error.hpp>
+#include "prefetch.hpp"
+#include "utility.hpp"
+#include "sdbusplus.hpp"
+
+namespace phosphor
+{
+namespace fan
+{
+namespace control
+{
+
+using InternalFailure = sdbusplus::xyz::openbmc_project::Common::
+                             Error::InternalFailure;
+
+constexpr auto OBJECT_MANAGER_INTERFACE = "org.freedesktop.DBus.ObjectManager";
+
+void PropertyPrefetch::add(const std::vector<PropertyFetch>& plan)
+{
+    for (auto& fetch : plan)
+    {
+        auto& paths = _plan[std::make_pair(
+                std::get<fetchInterfacePos>(fetch),
+                std::get<fetchNamespacePos>(fetch))];
+        paths.insert(std::get<fetchPathsPos>(fetch).begin(),
+                     std::get<fetchPathsPos>(fetch).end());
+    }
+}
+
+void PropertyPrefetch::fetch()
+{
+    using Intfs = std::vector<std::string>;
+    using ManagedObjects =
+        std::map<sdbusplus::message::object_path,
+                 std::map<std::string,
+                          std::map<std::string, FetchedVariantType>>>;
+
+    // The object managers above each namespace, and the objects of
+    // each service's object manager, are shared by the plan's entries
+    std::map<std::string, Objects> managers;
+    std::map<std::pair<std::string, std::string>, ManagedObjects> managed;
+
+    for (auto& entry : _plan)
+    {
+        const std::string& intf = entry.first.first;
+        const std::string& ns = entry.first.second;
+        auto& paths = entry.second;
+        try
+        {
+            // Resolve the services of all the interface's objects at once
+            auto& objects = _services[entry.first];
+            objects = util::SDBusPlus::getSubTree(_bus, ns, intf, 0);
+
+            std::set<std::string> services;
+            for (auto& path : paths)
+            {
+                auto objIter = objects.find(path);
+                if (objIter != objects.end())
+                {
+                    for (auto& serv : objIter->second)
+                    {
+                        services.insert(serv.first);
+                    }
+                }
+            }
+            if (services.empty())
+            {
+                continue;
+            }
+
+            // Each service's object manager nearest the namespace lists
+            // the properties of all the service's objects within it
+            auto mIter = managers.find(ns);
+            if (mIter == managers.end())
+            {
+                mIter = managers.emplace(
+                    ns,
+                    util::SDBusPlus::callMethodAndRead<Objects>(
+                            _bus,
+                            util::MAPPER_BUSNAME,
+                            util::MAPPER_PATH,
+                            util::MAPPER_INTERFACE,
+                            "GetAncestors",
+                            ns,
+                            Intfs{OBJECT_MANAGER_INTERFACE})).first;
+            }
+            for (auto& service : services)
+            {
+                std::string manager;
+                for (auto& ancestor : mIter->second)
+                {
+                    if (ancestor.second.find(service) !=
+                            ancestor.second.end() &&
+                        ancestor.first.size() > manager.size())
+                    {
+                        manager = ancestor.first;
+                    }
+                }
+                if (manager.empty())
+                {
+                    continue;
+                }
+
+                auto key = std::make_pair(service, manager);
+                auto objsIter = managed.find(key);
+                if (objsIter == managed.end())
+                {
+                    objsIter = managed.emplace(
+                        key,
+                        util::SDBusPlus::callMethodAndRead<ManagedObjects>(
+                                _bus,
+                                service,
+                                manager,
+                                OBJECT_MANAGER_INTERFACE,
+                                "GetManagedObjects")).first;
+                }
+                for (auto& oIter : objsIter->second)
+                {
+                    auto& path = static_cast<const std::string&>(oIter.first);
+                    auto intfIter = oIter.second.find(intf);
+                    if (intfIter == oIter.second.end() ||
+                        paths.find(path) == paths.end())
+                    {
+                        continue;
+                    }
+                    auto& values = _values[path][intf];
+                    for (auto& prop : intfIter->second)
+                    {
+                        if (!prop.second.is<std::vector<uint8_t>>())
+                        {
+                            values.emplace(prop.first, prop.second);
+                        }
+                    }
+                }
+            }
+        }
+        catch (const util::DBusError& e)
+        {
+            // Properties not read here are read by each event's
+            // handlers when the event is initialized
+        }
+        catch (const InternalFailure& e)
+        {
+            // No objects implement the interface within the namespace
+        }
+    }
+}
+
+const PropertyPrefetch::Objects* PropertyPrefetch::getServices(
+        const PropertyFetch& fetch) const
+{
+    auto it = _services.find(std::make_pair(
+            std::get<fetchInterfacePos>(fetch),
+            std::get<fetchNamespacePos>(fetch)));
+    if (it == _services.end())
+    {
+        return nullptr;
+    }
+    return &it->second;
+}
+
+const FetchedVariantType* PropertyPrefetch::getValue(
+        const std::string& object,
+        const std::string& interface,
+        const std::string& property) const
+{
+    auto objIter = _values.find(object);
+    if (objIter == _values.end())
+    {
+        return nullptr;
+    }
+    auto intfIter = objIter->second.find(interface);
+    if (intfIter == objIter->second.end())
+    {
+        return nullptr;
+    }
+    auto propIter = intfIter->second.find(property);
+    if (propIter == intfIter->second.end())
+    {
+        return nullptr;
+    }
+    return &propIter->second;
+}
+
+}
+}
+}
@@ -0,0 +1,138 @@
+#pragma once
+#include <map>
+#include <set>
+#include <string>
+#include <tuple>
+#include <vector>
+#include <sdbusplus/bus.hpp>
+#include "types.hpp"
+
+namespace phosphor
+{
+namespace fan
+{
+namespace control
+{
+
+/**
+ * The value of a property read in bulk.  The first alternative is what
+ * sdbusplus leaves for a value of a type not listed, so values holding it
+ * are dropped, leaving any byte array properties to be read on their own.
+ */
+using FetchedVariantType = sdbusplus::message::variant<std::vector<uint8_t>,
+                                                       bool,
+                                                       uint8_t,
+                                                       int16_t,
+                                                       uint16_t,
+                                                       int32_t,
+                                                       uint32_t,
+                                                       int64_t,
+                                                       uint64_t,
+                                                       double,
+                                                       std::string>;
+
+/**
+ * @class PropertyPrefetch
+ *
+ * The services and initial property values of the objects given by the
+ * fetch plans of the zones, read once for all of the zones.  The plans'
+ * entries for the same interface and namespace are merged, each resolving
+ * its objects' services with a single subtree lookup, and each service's
+ * object manager is asked for its objects' properties once, however many
+ * entries and zones it serves.  Any values not read are read by the
+ * zones' events as before.
+ *
+ */
+class PropertyPrefetch
+{
+    public:
+
+        PropertyPrefetch() = delete;
+        PropertyPrefetch(const PropertyPrefetch&) = delete;
+        PropertyPrefetch(PropertyPrefetch&&) = delete;
+        PropertyPrefetch& operator=(const PropertyPrefetch&) = delete;
+        PropertyPrefetch& operator=(PropertyPrefetch&&) = delete;
+        ~PropertyPrefetch() = default;
+
+        using Objects = std::map<std::string,
+                                 std::map<std::string,
+                                          std::vector<std::string>>>;
+
+        /**
+         * Creates an empty prefetch
+         *
+         * @param[in] bus - the dbus object
+         */
+        explicit PropertyPrefetch(sdbusplus::bus::bus& bus) :
+            _bus(bus)
+        {
+        }
+
+        /**
+         * @brief Add a zone's fetch plan to the objects to read
+         *
+         * @param[in] plan - The interfaces and objects the zone reads
+         */
+        void add(const std::vector<PropertyFetch>& plan);
+
+        /**
+         * @brief Read the services and properties of the objects of all
+         * the plans added
+         */
+        void fetch();
+
+        /**
+         * @brief Get the services of the objects of a plan entry's
+         * interface within its namespace
+         *
+         * @param[in] fetch - The plan entry
+         *
+         * @return - The services of each object's interfaces, or nullptr
+         *           when they were not read
+         */
+        const Objects* getServices(const PropertyFetch& fetch) const;
+
+        /**
+         * @brief Get the value read of an object's property
+         *
+         * @param[in] object - Name of the object containing the property
+         * @param[in] interface - Interface name containing the property
+         * @param[in] property - Property name
+         *
+         * @return - The property value, or nullptr when it was not read
+         */
+        const FetchedVariantType* getValue(const std::string& object,
+                                           const std::string& interface,
+                                           const std::string& property) const;
+
+    private:
+
+        /**
+         * The dbus object
+         */
+        sdbusplus::bus::bus& _bus;
+
+        /**
+         * The objects to read for each interface and namespace
+         */
+        std::map<std::pair<std::string, std::string>,
+                 std::set<std::string>> _plan;
+
+        /**
+         * The services of the objects read for each interface and
+         * namespace
+         */
+        std::map<std::pair<std::string, std::string>, Objects> _services;
+
+        /**
+         * The property values read of each object's interfaces
+         */
+        std::map<std::string,
+                 std::map<std::string,
+                          std::map<std::string,
+                                   FetchedVariantType>>> _values;
+};
+
+}
+}
+}
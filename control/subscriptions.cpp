@@ -0,0 +1,61 @@
+/**
+ * Copyright © 2017 IBM Corporation
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+#include "subscriptions.hpp"
+
+namespace phosphor
+{
+namespace fan
+{
+namespace control
+{
+
+void SignalSubscriptions::subscribe(size_t id,
+                                    const std::string& match,
+                                    SignalCallback&& callback)
+{
+    auto& subscription = _subscriptions[id];
+    auto& callbacks = std::get<subscriptionCallbacksPos>(subscription);
+    callbacks.emplace_back(std::move(callback));
+
+    if (std::get<subscriptionMatchPos>(subscription) == nullptr)
+    {
+        std::get<subscriptionMatchPos>(subscription) =
+            std::make_unique<sdbusplus::server::match::match>(
+                    _bus,
+                    match.c_str(),
+                    std::bind(std::mem_fn(&SignalSubscriptions::handleSignal),
+                              this,
+                              std::placeholders::_1,
+                              &callbacks)
+                );
+    }
+}
+
+void SignalSubscriptions::handleSignal(
+        sdbusplus::message::message& msg,
+        const std::vector<SignalCallback>* callbacks)
+{
+    for (auto& callback : *callbacks)
+    {
+        // Each subscriber reads the message from its start
+        sd_bus_message_rewind(msg.get(), true);
+        callback(msg);
+    }
+}
+
+}
+}
+}
@@ -0,0 +1,95 @@
+#pragma once
+#include <functional>
+#include <map>
+#include <memory>
+#include <string>
+#include <tuple>
+#include <vector>
+#include <sdbusplus/bus.hpp>
+#include <sdbusplus/server.hpp>
+
+namespace phosphor
+{
+namespace fan
+{
+namespace control
+{
+
+/**
+ * A callback run for a signal delivered to a subscription
+ */
+using SignalCallback = std::function<void(sdbusplus::message::message&)>;
+
+constexpr auto subscriptionCallbacksPos = 0;
+constexpr auto subscriptionMatchPos = 1;
+using Subscription =
+    std::tuple<std::vector<SignalCallback>,
+               std::unique_ptr<sdbusplus::server::match::match>>;
+
+/**
+ * @class SignalSubscriptions
+ *
+ * The Dbus signal matches shared by the zones.  Each shared signal is
+ * subscribed to with a single match, delivering every signal received to
+ * the callback of each zone subscribed to it.
+ *
+ */
+class SignalSubscriptions
+{
+    public:
+
+        SignalSubscriptions() = delete;
+        SignalSubscriptions(const SignalSubscriptions&) = delete;
+        SignalSubscriptions(SignalSubscriptions&&) = delete;
+        SignalSubscriptions& operator=(const SignalSubscriptions&) = delete;
+        SignalSubscriptions& operator=(SignalSubscriptions&&) = delete;
+        ~SignalSubscriptions() = default;
+
+        /**
+         * Creates the shared signal subscriptions
+         *
+         * @param[in] bus - the dbus object
+         */
+        explicit SignalSubscriptions(sdbusplus::bus::bus& bus) :
+            _bus(bus)
+        {
+        }
+
+        /**
+         * @brief Subscribe to a shared signal, adding the signal's match
+         * when first subscribed to
+         *
+         * @param[in] id - The generated id of the shared signal
+         * @param[in] match - The signal's match string
+         * @param[in] callback - The callback to run for each signal
+         */
+        void subscribe(size_t id,
+                       const std::string& match,
+                       SignalCallback&& callback);
+
+    private:
+
+        /**
+         * @brief Dbus signal callback running the callback of each
+         * subscriber to the signal
+         *
+         * @param[in] msg - Expanded sdbusplus message data
+         * @param[in] callbacks - The subscribers' callbacks
+         */
+        void handleSignal(sdbusplus::message::message& msg,
+                          const std::vector<SignalCallback>* callbacks);
+
+        /**
+         * The dbus object
+         */
+        sdbusplus::bus::bus& _bus;
+
+        /**
+         * The subscriptions to each shared signal by id
+         */
+        std::map<size_t, Subscription> _subscriptions;
+};
+
+}
+}
+}
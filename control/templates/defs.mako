@@ -1,83 +1,412 @@
 <%!
-def indent(str, depth):
-    return ''.join(4*' '*depth+line for line in str.splitlines(True))
+import json
+import numbers
+
+
+def literal(value, string):
+    if string:
+        return '"' + str(value) + '"'
+    return str(value).lower()
+
+
+def tableValue(value):
+    if isinstance(value, bool):
+        return str(value).lower()
+    elif isinstance(value, float):
+        return repr(value)
+    elif isinstance(value, numbers.Integral):
+        return str(value)
+    # Quoted and escaped as a JSON string, which is also a valid C++
+    # string literal
+    return json.dumps(value)
+
+
+def actionParam(p, lookup):
+    if p.kind == 'actions':
+        param = "std::vector<Action>{"
+        for a in p.actions:
+            param += "make_action(action::" + a.name
+            if a.params:
+                param += "(\n" + ",".join(actionParam(ap, lookup)
+                                          for ap in a.params) + ")"
+            param += "),"
+        return param + "}"
+    elif p.kind == 'timer':
+        return ("Timer{static_cast<std::chrono::seconds>(" +
+                str(p.seconds) + "), util::Timer::TimerType::" +
+                str(p.type) + "}")
+    elif p.kind == 'table':
+        tableType = "LookupTable<" + p.key_type + ", " + p.value_type + ">"
+        if not p.entries:
+            return tableType + "{nullptr, 0}"
+        return (tableType + "{table" + str(lookup(p)) + ", " +
+                str(len(p.entries)) + "}")
+    return ("static_cast<" + p.type + ">(" +
+            literal(p.value, p.string) + ")")
+
+
+def tableStorage(table):
+    # Tables of strings are initialized at runtime
+    if 'string' in (table.key_type + table.value_type).lower():
+        return 'const'
+    return 'constexpr'
 %>\
 
-<%def name="genHandler(sig)" buffered="True">
-%if ('type' in sig['sparams']) and \
-    (sig['sparams']['type'] is not None):
-${sig['signal']}<${sig['sparams']['type']}>(
+<%def name="genHandler(sig)">
+%if sig.signal.type is not None:
+${sig.signal.name}<${sig.signal.type}>(
 %else:
-${sig['signal']}(
+${sig.signal.name}(
 %endif
-%for spk in sig['sparams']['params']:
-${sig['sparams'][spk]},
+%for sp in sig.signal.params:
+${genParam(param=sp)},
 %endfor
-%if ('type' in sig['hparams']) and \
-    (sig['hparams']['type'] is not None):
-handler::${sig['handler']}<${sig['hparams']['type']}>(
+%if sig.handler.type is not None:
+handler::${sig.handler.name}<${sig.handler.type}>(
 %else:
-handler::${sig['handler']}(
+handler::${sig.handler.name}(
 %endif
-%for i, hpk in enumerate(sig['hparams']['params']):
-    %if (i+1) != len(sig['hparams']['params']):
-    ${sig['hparams'][hpk]},
+%for i, hp in enumerate(sig.handler.params):
+    %if (i+1) != len(sig.handler.params):
+    ${genParam(param=hp)},
     %else:
-    ${sig['hparams'][hpk]}
+    ${genParam(param=hp)}
     %endif
 %endfor
 ))
 </%def>\
 
-<%def name="genSSE(event)" buffered="True">
-Group{
-%for group in event['groups']:
-%for member in group['members']:
+<%def name="genPathSignals(sig)">
+${sig.dispatch}({
+%for m in sig.members:
+    {names[${name.index(m.path)}], make_handler(\
+${out.indent(2)}${genHandler(sig=m)}${out.dedent()}\
+    )},
+%endfor
+})
+</%def>\
+<%def name="genSharedSignal(id, sig)">
+sharedSignal(${id}, make_handler(\
+%if sig.members is not None:
+${out.indent(1)}${genPathSignals(sig=sig)}${out.dedent()}\
+%else:
+${out.indent(1)}${genHandler(sig=sig)}${out.dedent()}\
+%endif
+))
+</%def>\
+<%def name="genParam(param)">\
+%if param.kind == 'group':
+*${param.value.shared}\
+%elif param.kind == 'slot':
+${slot.index(param.value)}\
+%elif param.kind == 'slots':
+std::vector<size_t>{${', '.join(str(i) for i in slot.interface(param.value))}}\
+%else:
+names[${name.index(param.value)}].c_str()\
+%endif
+</%def>\
+<%def name="genStringTable(table, storage='')">\
+${name.use(table)}\
+%if table['names']:
+/* The D-Bus names used by the definitions, each generated once */
+${storage}const std::string names[]
 {
-    "${member['object']}",
-    {"${member['interface']}",
-     "${member['property']}"}
-},
+%for n in table['names']:
+    "${n}",
 %endfor
+};
+%endif
+%if table['tables']:
+/* The lookup tables used by the actions, each generated once */
+%endif
+%for i, t in enumerate(table['tables']):
+${storage}${tableStorage(t)} std::pair<${t.key_type}, ${t.value_type}> table${i}[]
+{
+%for k, v in t.entries:
+    {${tableValue(k)}, ${tableValue(v)}},
 %endfor
-},
-std::vector<Action>{
-%for a in event['action']:
-%if len(a['parameters']) != 0:
-make_action(action::${a['name']}(
+};
+%endfor
+</%def>\
+<%def name="genActions(actions)">\
+%for a in actions:
+%if len(a.params) != 0:
+make_action(action::${a.name}(
 %else:
-make_action(action::${a['name']}
+make_action(action::${a.name}
 %endif
-%for i, p in enumerate(a['parameters']):
-%if (i+1) != len(a['parameters']):
-    ${p},
+%for i, p in enumerate(a.params):
+%if (i+1) != len(a.params):
+    ${actionParam(p, name.lookup)},
 %else:
-    ${p})
+    ${actionParam(p, name.lookup)})
 %endif
 %endfor
 ),
 %endfor
+</%def>\
+<%def name="genSSE(event, bucketed=False)">
+%if event.group_name is not None:
+${event.group_name},
+%else:
+std::make_shared<const Group>(Group{
+%for group in event.groups:
+%for member in group.members:
+{
+    names[${name.index(member.object)}],
+    {names[${name.index(member.interface)}],
+     names[${name.index(member.property)}],
+     ${slot.index(member)}}
 },
+%endfor
+%endfor
+}),
+%endif
+%if event.actions_name is not None:
+${event.actions_name},
+%else:
+std::make_shared<const std::vector<Action>>(std::vector<Action>{
+${genActions(actions=event.actions)}\
+}),
+%endif
 Timer{
-    ${event['timer']['interval']},
-    ${event['timer']['type']}
+%if bucketed:
+    static_cast<std::chrono::seconds>(0),
+%else:
+    static_cast<std::chrono::seconds>(${event.timer.seconds}),
+%endif
+    util::Timer::TimerType::${event.timer.type}
 },
 std::vector<Signal>{
-%for s in event['signals']:
+%for si, s in enumerate(event.signals):
     Signal{
-        match::${s['match']}(
-        %for i, mp in enumerate(s['mparams']):
-        %if (i+1) != len(s['mparams']):
-        "${mp}",
+        %if s.rule is not None:
+        "${s.rule}",
+        %else:
+        match::${s.match}(
+        %for i, mp in enumerate(s.mparams):
+        %if (i+1) != len(s.mparams):
+        names[${name.index(mp)}],
         %else:
-        "${mp}"
+        names[${name.index(mp)}]
         %endif
         %endfor
         ),
+        %endif
         make_handler(\
-        ${indent(genHandler(sig=s), 3)}\
+        %if event.shared_ids is not None:
+        ${out.indent(3)}${genSharedSignal(id=event.shared_ids[si], sig=s)}${out.dedent()}\
+        %elif s.members is not None:
+        ${out.indent(3)}${genPathSignals(sig=s)}${out.dedent()}\
+        %else:
+        ${out.indent(3)}${genHandler(sig=s)}${out.dedent()}\
+        %endif
         )
     },
 %endfor
 }
 </%def>\
+<%def name="genSharedObjects(groups, actions, storage='')">\
+%for group in groups:
+${storage}const auto ${group.name} = std::make_shared<const Group>(Group{
+%for member in group.members:
+    {
+        names[${name.index(member.object)}],
+        {names[${name.index(member.interface)}],
+         names[${name.index(member.property)}],
+         ${slot.index(member)}}
+    },
+%endfor
+});
+%endfor
+%for a in actions:
+${storage}const auto ${a.name} =
+    std::make_shared<const std::vector<Action>>(std::vector<Action>{
+${out.indent(1)}${genActions(actions=a.actions)}${out.dedent()}\
+});
+%endfor
+</%def>\
+<%def name="genConditions(conditions)">\
+std::vector<Condition>{
+%for condition in conditions:
+    Condition{
+        "${condition.type}",
+        std::vector<ConditionProperty>{
+        %for property in condition.properties:
+            ConditionProperty{
+                names[${name.index(property.property)}],
+                names[${name.index(property.interface)}],
+                names[${name.index(property.path)}],
+                static_cast<${property.type}>(${literal(property.value, False)}),
+            },
+            %endfor
+        },
+    },
+    %endfor
+},
+</%def>\
+<%def name="genZoneDefinition(zone)">\
+${zone.num},
+${zone.full_speed},
+${zone.default_floor},
+${zone.increase_delay},
+${zone.decrease_interval},
+std::vector<FanDefinition>{
+%for fan in zone.fans:
+    FanDefinition{
+        "${fan.name}",
+        std::vector<std::string>{
+        %for sensor in fan.sensors:
+            "${sensor}",
+        %endfor
+        },
+        "${fan.target_interface}"
+    },
+%endfor
+},
+std::vector<SetSpeedEvent>{
+%for ei, event in enumerate(zone.events):
+    %if event.pc is not None:
+    SetSpeedEvent{
+        %if event.pc.group_name is not None:
+        ${event.pc.group_name},
+        %else:
+        std::make_shared<const Group>(Group{
+        %for group in event.pc.groups:
+        %for member in group.members:
+        {
+            names[${name.index(member.object)}],
+            {names[${name.index(member.interface)}],
+             names[${name.index(member.property)}],
+             ${slot.index(member)}}
+        },
+        %endfor
+        %endfor
+        }),
+        %endif
+        std::make_shared<const std::vector<Action>>(std::vector<Action>{
+        %for i, a in enumerate(event.pc.actions):
+        %if len(a.params) != 0:
+        make_action(
+            precondition::${a.name}(
+        %else:
+        make_action(
+            precondition::${a.name}
+        %endif
+        %for p in a.params:
+        std::vector<PrecondGroup>{
+        %for j, v in enumerate(p):
+        %if (j+1) != len(p):
+            PrecondGroup{names[${name.index(v.object)}],names[${name.index(v.interface)}],names[${name.index(v.property)}],static_cast<${v.type.lower()}>(${literal(v.value, v.string)}),${slot.index(v)}},
+        %else:
+            PrecondGroup{names[${name.index(v.object)}],names[${name.index(v.interface)}],names[${name.index(v.property)}],static_cast<${v.type.lower()}>(${literal(v.value, v.string)}),${slot.index(v)}}
+        %endif
+        %endfor
+        },
+        %endfor
+        %if (i+1) != len(event.pc.actions):
+        %if len(a.params) != 0:
+        )),
+        %else:
+        ),
+        %endif
+        %endif
+        %endfor
+    std::vector<SetSpeedEvent>{
+    %for pcevt in event.pc.events:
+    SetSpeedEvent{\
+                                    ${out.indent(2)}${genSSE(event=pcevt)}${out.dedent()}\
+    },
+    %endfor
+    %else:
+    SetSpeedEvent{\
+                                    ${out.indent(2)}${genSSE(event=event, bucketed=(ei in zone.bucketed))}${out.dedent()}
+    %endif
+    %if event.pc is not None:
+    }
+        %if len(event.pc.actions[-1].params) != 0:
+        )),
+        %else:
+        ),
+        %endif
+        }),
+        Timer{
+        %if ei in zone.bucketed:
+            static_cast<std::chrono::seconds>(0),
+        %else:
+            static_cast<std::chrono::seconds>(${event.pc.timer.seconds}),
+        %endif
+            util::Timer::TimerType::${event.pc.timer.type}
+        },
+        std::vector<Signal>{
+        %for s in event.pc.signals:
+            Signal{
+                %if s.rule is not None:
+                "${s.rule}",
+                %else:
+                match::${s.match}(
+                %for i, mp in enumerate(s.mparams):
+                %if (i+1) != len(s.mparams):
+                names[${name.index(mp)}],
+                %else:
+                names[${name.index(mp)}]
+                %endif
+                %endfor
+                ),
+                %endif
+                make_handler(\
+                %if s.members is not None:
+                                                ${out.indent(5)}${genPathSignals(sig=s)}${out.dedent()}\
+                %else:
+                                                ${out.indent(5)}${genHandler(sig=s)}${out.dedent()}\
+                %endif
+                )
+            },
+        %endfor
+        }
+    %endif
+    },
+%endfor
+},
+std::vector<PropertyFetch>{
+%for fetch in zone.fetches:
+    PropertyFetch{
+        names[${name.index(fetch.interface)}],
+        names[${name.index(fetch.namespace)}],
+        std::vector<Name>{
+        %for path in fetch.paths:
+            names[${name.index(path)}],
+        %endfor
+        }
+    },
+%endfor
+},
+std::vector<TimerBucket>{
+%for bucket in zone.buckets:
+    TimerBucket{
+        static_cast<std::chrono::seconds>(${bucket.interval}),
+        std::vector<size_t>{
+        %for i in bucket.events:
+            ${i},
+        %endfor
+        }
+    },
+%endfor
+}
+</%def>\
+<%def name="genUnit(unit)">\
+void addZoneDefinitions${unit['num']}(std::vector<ZoneDefinition>& zones)
+{
+%if unit['strings']['names'] or unit['strings']['tables'] or unit['groups'] or unit['actions']:
+    /* Function local so they are constructed before their first use,
+     * whatever order the generated sources are initialized in */
+%endif
+${out.indent(1)}${genStringTable(table=unit['strings'], storage='static ')}${out.dedent()}\
+${out.indent(1)}${genSharedObjects(groups=unit['groups'], actions=unit['actions'], storage='static ')}${out.dedent()}\
+%for zone in unit['zones']:
+    zones.push_back(ZoneDefinition{
+${out.indent(2)}${genZoneDefinition(zone=zone)}${out.dedent()}\
+    });
+%endfor
+}
+</%def>\
@@ -0,0 +1,86 @@
+<%namespace file="defs.mako" import="*"/>\
+<%!
+def array(name, size):
+    if size == 0:
+        return '{nullptr, 0}'
+    return '{' + name + ', ' + str(size) + '}'
+%>\
+/* This is a generated file. */
+#include "manager.hpp"
+%if not unit_sources:
+#include "functor.hpp"
+#include "actions.hpp"
+#include "handlers.hpp"
+#include "preconditions.hpp"
+#include "matches.hpp"
+%endif
+
+using namespace phosphor::fan::control;
+
+%for unit in units:
+%if unit_sources:
+void addZoneDefinitions${unit['num']}(std::vector<ZoneDefinition>& zones);
+%else:
+${genUnit(unit=unit)}
+%endif
+%endfor
+%if unit_sources:
+
+%endif
+const unsigned int Manager::_powerOnDelay{${mgr_data['power_on_delay']}};
+
+const std::vector<ZoneGroup> Manager::_zoneLayouts{};
+
+namespace
+{
+%for i, zone_group in enumerate(zones):
+%for j, condition in enumerate(zone_group.conditions):
+%if condition.properties:
+constexpr ConstConditionProperty conditionProperties${i}_${j}[]
+{
+%for property in condition.properties:
+    ConstConditionProperty{
+        "${property.property}",
+        "${property.interface}",
+        "${property.path}",
+        static_cast<${property.type}>(${str(property.value).lower()}),
+    },
+%endfor
+};
+%endif
+%endfor
+%if zone_group.conditions:
+constexpr ConstCondition conditions${i}[]
+{
+%for j, condition in enumerate(zone_group.conditions):
+    ConstCondition{
+        "${condition.type}",
+        ${array('conditionProperties%d_%d' % (i, j), len(condition.properties))}
+    },
+%endfor
+};
+%endif
+std::vector<ZoneDefinition> zoneDefinitions${i}()
+{
+    std::vector<ZoneDefinition> zones;
+%for unit in zone_group.units:
+    addZoneDefinitions${unit['num']}(zones);
+%endfor
+    return zones;
+}
+%endfor
+%if zones:
+constexpr ConstZoneGroup zoneGroups[]
+{
+%for i, zone_group in enumerate(zones):
+    ConstZoneGroup{
+        ${array('conditions%d' % i, len(zone_group.conditions))},
+        zoneDefinitions${i}
+    },
+%endfor
+};
+%endif
+} // namespace
+
+const ConstArray<ConstZoneGroup> Manager::_constZoneLayouts\
+${array('zoneGroups', len(zones))};
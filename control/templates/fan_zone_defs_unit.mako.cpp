@@ -0,0 +1,14 @@
+<%namespace file="defs.mako" import="*"/>\
+/* This is a generated file. */
+#include "manager.hpp"
+#include "functor.hpp"
+#include "actions.hpp"
+#include "handlers.hpp"
+#include "preconditions.hpp"
+#include "matches.hpp"
+
+using namespace phosphor::fan::control;
+%for unit in units:
+
+${genUnit(unit=unit)}\
+%endfor
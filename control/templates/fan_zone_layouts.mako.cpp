@@ -0,0 +1,45 @@
+<%namespace file="defs.mako" import="*"/>\
+/* This is a generated file. */
+#include "manager.hpp"
+
+using namespace phosphor::fan::control;
+
+%for unit in units:
+void addZoneDefinitions${unit['num']}(std::vector<ZoneDefinition>& zones);
+%endfor
+
+const unsigned int Manager::_powerOnDelay{${mgr_data['power_on_delay']}};
+
+const ConstArray<ConstZoneGroup> Manager::_constZoneLayouts{};
+
+namespace
+{
+${genStringTable(table=strings)}\
+%if zones:
+/* Combines the zone definitions added by each generated source */
+std::vector<ZoneDefinition> makeZoneDefinitions(
+    std::initializer_list<void (*)(std::vector<ZoneDefinition>&)> units)
+{
+    std::vector<ZoneDefinition> zones;
+    for (auto add : units)
+    {
+        add(zones);
+    }
+    return zones;
+}
+%endif
+} // namespace
+
+const std::vector<ZoneGroup> Manager::_zoneLayouts
+{
+%for zone_group in zones:
+    ZoneGroup{
+${out.indent(2)}${genConditions(conditions=zone_group.conditions)}${out.dedent()}\
+        makeZoneDefinitions({
+        %for unit in zone_group.units:
+            addZoneDefinitions${unit['num']},
+        %endfor
+        })
+    },
+%endfor
+};
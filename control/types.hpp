@@ -1,4 +1,5 @@
 #pragma once
+#include <memory>
 #include <string>
 #include <tuple>
 #include <vector>
@@ -14,15 +15,66 @@ namespace control
 
 class Zone;
 
+/**
+ * @class Name
+ * @brief A D-Bus object path, interface or property name within the
+ * generated definitions
+ * @details Refers to the name's entry in the generated string table rather
+ * than holding a copy of the name, so every copy of the definitions using
+ * the name shares the table's single string. Names compare by value.
+ */
+class Name
+{
+    public:
+        Name() = delete;
+
+        /**
+         * @brief Refer to a string that outlives the name, such as an
+         * entry of the generated string table
+         *
+         * @param[in] name - The string referred to
+         */
+        Name(const std::string& name) : _name(&name) {}
+        Name(std::string&&) = delete;
+
+        operator const std::string&() const
+        {
+            return *_name;
+        }
+
+        const char* c_str() const
+        {
+            return _name->c_str();
+        }
+
+        friend bool operator==(const Name& lhs, const Name& rhs)
+        {
+            return lhs._name == rhs._name || *lhs._name == *rhs._name;
+        }
+
+        friend bool operator!=(const Name& lhs, const Name& rhs)
+        {
+            return !(lhs == rhs);
+        }
+
+        friend bool operator<(const Name& lhs, const Name& rhs)
+        {
+            return *lhs._name < *rhs._name;
+        }
+
+    private:
+        const std::string* _name;
+};
+
 constexpr auto propertyNamePos = 0;
 constexpr auto propertyInterfacePos = 1;
 constexpr auto propertyPathPos = 2;
 constexpr auto propertyValuePos = 3;
 
 // TODO openbmc/openbmc#1769: Support more property types.
-using ConditionProperty = std::tuple<std::string,
-                          std::string,
-                          std::string,
+using ConditionProperty = std::tuple<Name,
+                          Name,
+                          Name,
                           bool>;
 
 constexpr auto conditionTypePos = 0;
@@ -43,7 +95,8 @@ using FanDefinition = std::tuple<std::string,
 
 constexpr auto intfPos = 0;
 constexpr auto propPos = 1;
-using Group = std::map<std::string, std::tuple<std::string, std::string>>;
+constexpr auto slotPos = 2;
+using Group = std::map<Name, std::tuple<Name, Name, size_t>>;
 using Handler = std::function<void(sdbusplus::bus::bus&,
                                    sdbusplus::message::message&,
                                    Zone&)>;
@@ -53,10 +106,12 @@ constexpr auto pcPathPos = 0;
 constexpr auto pcIntfPos = 1;
 constexpr auto pcPropPos = 2;
 constexpr auto pcValuePos = 3;
-using PrecondGroup = std::tuple<std::string,
-                                std::string,
-                                std::string,
-                                PropertyVariantType>;
+constexpr auto pcSlotPos = 4;
+using PrecondGroup = std::tuple<Name,
+                                Name,
+                                Name,
+                                PropertyVariantType,
+                                size_t>;
 
 constexpr auto namePos = 0;
 constexpr auto hasOwnerPos = 1;
@@ -67,16 +122,51 @@ constexpr auto typePos = 1;
 using Timer = std::tuple<std::chrono::seconds,
                          util::Timer::TimerType>;
 
+/**
+ * @class Match
+ * @brief A signal's match string
+ * @details Given as the match string itself, or as a function building
+ * the match string when a zone initializes the signal's event, for matches
+ * needing what the zone looks up from dbus, such as an object's service.
+ */
+class Match
+{
+    public:
+        using Builder = std::function<std::string(Zone&)>;
+
+        Match() = delete;
+
+        Match(const char* match) : _match(match) {}
+        Match(std::string match) : _match(std::move(match)) {}
+        Match(Builder builder) : _builder(std::move(builder)) {}
+
+        /**
+         * @brief Get the match string for a zone
+         *
+         * @param[in] zone - The zone initializing the signal's event
+         *
+         * @return - The match string
+         */
+        std::string get(Zone& zone) const
+        {
+            return _builder ? _builder(zone) : _match;
+        }
+
+    private:
+        std::string _match;
+        Builder _builder;
+};
+
 constexpr auto sigMatchPos = 0;
 constexpr auto sigHandlerPos = 1;
-using Signal = std::tuple<std::string, Handler>;
+using Signal = std::tuple<Match, Handler>;
 
 constexpr auto groupPos = 0;
 constexpr auto actionsPos = 1;
 constexpr auto timerPos = 2;
 constexpr auto signalsPos = 3;
-using SetSpeedEvent = std::tuple<Group,
-                                 std::vector<Action>,
+using SetSpeedEvent = std::tuple<std::shared_ptr<const Group>,
+                                 std::shared_ptr<const std::vector<Action>>,
                                  Timer,
                                  std::vector<Signal>>;
 
@@ -84,7 +174,10 @@ constexpr auto eventGroupPos = 0;
 constexpr auto eventMatchPos = 1;
 constexpr auto eventHandlerPos = 2;
 constexpr auto eventActionsPos = 3;
-using EventData = std::tuple<Group, std::string, Handler, std::vector<Action>>;
+using EventData = std::tuple<std::shared_ptr<const Group>,
+                             std::string,
+                             Handler,
+                             std::shared_ptr<const std::vector<Action>>>;
 
 constexpr auto timerEventDataPos = 0;
 constexpr auto timerTimerPos = 1;
@@ -98,6 +191,18 @@ using SignalEvent =
     std::tuple<std::unique_ptr<EventData>,
                std::unique_ptr<sdbusplus::server::match::match>>;
 
+constexpr auto fetchInterfacePos = 0;
+constexpr auto fetchNamespacePos = 1;
+constexpr auto fetchPathsPos = 2;
+using PropertyFetch = std::tuple<Name,
+                                 Name,
+                                 std::vector<Name>>;
+
+constexpr auto bucketIntervalPos = 0;
+constexpr auto bucketEventsPos = 1;
+using TimerBucket = std::tuple<std::chrono::seconds,
+                               std::vector<size_t>>;
+
 constexpr auto zoneNumPos = 0;
 constexpr auto fullSpeedPos = 1;
 constexpr auto floorSpeedPos = 2;
@@ -105,19 +210,72 @@ constexpr auto incDelayPos = 3;
 constexpr auto decIntervalPos = 4;
 constexpr auto fanListPos = 5;
 constexpr auto setSpeedEventsPos = 6;
+constexpr auto fetchPlanPos = 7;
+constexpr auto timerBucketsPos = 8;
 using ZoneDefinition = std::tuple<size_t,
                                   uint64_t,
                                   uint64_t,
                                   size_t,
                                   size_t,
                                   std::vector<FanDefinition>,
-                                  std::vector<SetSpeedEvent>>;
+                                  std::vector<SetSpeedEvent>,
+                                  std::vector<PropertyFetch>,
+                                  std::vector<TimerBucket>>;
 
 constexpr auto conditionListPos = 0;
 constexpr auto zoneListPos = 1;
 using ZoneGroup = std::tuple<std::vector<Condition>,
                              std::vector<ZoneDefinition>>;
 
+/**
+ * A view of a constant initialized array of generated data
+ */
+template <typename T>
+struct ConstArray
+{
+    const T* first;
+    size_t size;
+
+    constexpr const T* begin() const
+    {
+        return first;
+    }
+
+    constexpr const T* end() const
+    {
+        return first + size;
+    }
+
+    constexpr bool empty() const
+    {
+        return size == 0;
+    }
+};
+
+/**
+ * A table of key to value entries sorted by their keys, searched with a
+ * binary search rather than walking the nodes of a map. The entries are
+ * a static array generated with the definitions.
+ */
+template <typename K, typename V>
+using LookupTable = ConstArray<std::pair<K, V>>;
+
+// Constant initialized forms of the zone group data, generated when the
+// zone layouts are emitted as constant tables.  Only the zone definitions
+// of the zone group whose conditions are met get constructed, by calling
+// the group's zone list function.
+using ConstConditionProperty = std::tuple<const char*,
+                                          const char*,
+                                          const char*,
+                                          bool>;
+
+using ConstCondition = std::tuple<const char*,
+                                  ConstArray<ConstConditionProperty>>;
+
+using ZoneListFunction = std::vector<ZoneDefinition>(*)();
+using ConstZoneGroup = std::tuple<ConstArray<ConstCondition>,
+                                  ZoneListFunction>;
+
 }
 }
 }
@@ -14,11 +14,13 @@
  * limitations under the License.
  */
 #include <chrono>
+#include <set>
 #include <phosphor-logging/log.hpp>
 #include <phosphor-logging/elog.hpp>
 #include <phosphor-logging/elog-errors.hpp>
 #include <xyz/openbmc_project/Common/error.hpp>
 #include "zone.hpp"
+#include "functor.hpp"
 #include "utility.hpp"
 #include "sdbusplus.hpp"
 
@@ -38,7 +40,9 @@ using InternalFailure = sdbusplus::xyz::openbmc_project::Common::
 Zone::Zone(Mode mode,
            sdbusplus::bus::bus& bus,
            phosphor::fan::event::EventPtr& events,
-           const ZoneDefinition& def) :
+           const ZoneDefinition& def,
+           SignalSubscriptions* subscriptions,
+           const PropertyPrefetch* prefetch) :
     _bus(bus),
     _fullSpeed(std::get<fullSpeedPos>(def)),
     _zoneNum(std::get<zoneNumPos>(def)),
@@ -48,7 +52,8 @@ Zone::Zone(Mode mode,
     _decInterval(std::get<decIntervalPos>(def)),
     _incTimer(events, [this](){ this->incTimerExpired(); }),
     _decTimer(events, [this](){ this->decTimerExpired(); }),
-    _sdEvents(events)
+    _sdEvents(events),
+    _subscriptions(subscriptions)
 {
     auto& fanDefs = std::get<fanListPos>(def);
 
@@ -65,11 +70,29 @@ Zone::Zone(Mode mode,
         {
             _targetSpeed = _fans.front()->getTargetSpeed();
         }
+        // Use the services and initial state of the events' objects
+        // read in bulk for all the zones
+        if (prefetch != nullptr)
+        {
+            for (auto& fetch : std::get<fetchPlanPos>(def))
+            {
+                auto objects = prefetch->getServices(fetch);
+                if (objects != nullptr)
+                {
+                    addServTree(*objects);
+                }
+            }
+            _prefetch = prefetch;
+        }
         // Setup signal trigger for set speed events
         for (auto& event : std::get<setSpeedEventsPos>(def))
         {
             initEvent(event);
         }
+        // Later events read their initial state from dbus
+        _prefetch = nullptr;
+        startTimerBuckets(std::get<setSpeedEventsPos>(def),
+                          std::get<timerBucketsPos>(def));
         // Start timer for fan speed decreases
         if (!_decTimer.running() && _decInterval != seconds::zero())
         {
@@ -312,19 +335,35 @@ void Zone::initEvent(const SetSpeedEvent& event)
         // Initialize the event signal using handler
         std::get<sigHandlerPos>(sig)(_bus, nullMsg, *this);
         // Setup signal matches of the property for event
+        auto matchStr = std::get<sigMatchPos>(sig).get(*this);
         std::unique_ptr<EventData> eventData =
             std::make_unique<EventData>(
                     std::get<groupPos>(event),
-                    std::get<sigMatchPos>(sig),
+                    matchStr,
                     std::get<sigHandlerPos>(sig),
                     std::get<actionsPos>(event)
             );
         std::unique_ptr<sdbusplus::server::match::match> match = nullptr;
-        if (!std::get<sigMatchPos>(sig).empty())
+        auto shared = std::get<sigHandlerPos>(sig).target<SharedSignal>();
+        if (shared != nullptr && _subscriptions != nullptr)
+        {
+            // Subscribe to the match shared with the other zones
+            if (!matchStr.empty())
+            {
+                _subscriptions->subscribe(
+                        shared->id(),
+                        matchStr,
+                        std::bind(std::mem_fn(&Zone::handleEvent),
+                                  this,
+                                  std::placeholders::_1,
+                                  eventData.get()));
+            }
+        }
+        else if (!matchStr.empty())
         {
             match = std::make_unique<sdbusplus::server::match::match>(
                     _bus,
-                    std::get<sigMatchPos>(sig).c_str(),
+                    matchStr.c_str(),
                     std::bind(std::mem_fn(&Zone::handleEvent),
                               this,
                               std::placeholders::_1,
@@ -349,8 +388,8 @@ void Zone::initEvent(const SetSpeedEvent& event)
             std::make_unique<util::Timer>(
                 _sdEvents,
                 [this,
-                 action = &(std::get<actionsPos>(event)),
-                 group = &(std::get<groupPos>(event))]()
+                 action = std::get<actionsPos>(event),
+                 group = std::get<groupPos>(event)]()
                  {
                      this->timerExpired(*group, *action);
                  });
@@ -363,12 +402,12 @@ void Zone::initEvent(const SetSpeedEvent& event)
     }
     // Run action functions for initial event state
     std::for_each(
-        std::get<actionsPos>(event).begin(),
-        std::get<actionsPos>(event).end(),
+        std::get<actionsPos>(event)->begin(),
+        std::get<actionsPos>(event)->end(),
         [this, &event](auto const& action)
         {
             action(*this,
-                   std::get<groupPos>(event));
+                   *std::get<groupPos>(event));
         });
 }
 
@@ -380,9 +419,9 @@ void Zone::removeEvent(const SetSpeedEvent& event)
         _signalEvents.end(),
         [&event](auto const& se)
         {
-            auto seEventData = *std::get<signalEventDataPos>(se);
-            if (std::get<eventActionsPos>(seEventData).size() !=
-                std::get<actionsPos>(event).size())
+            const auto& seEventData = *std::get<signalEventDataPos>(se);
+            if (std::get<eventActionsPos>(seEventData)->size() !=
+                std::get<actionsPos>(event)->size())
             {
                 return false;
             }
@@ -398,11 +437,11 @@ void Zone::removeEvent(const SetSpeedEvent& event)
                         };
                 return
                 (
-                    std::get<eventGroupPos>(seEventData) ==
-                        std::get<groupPos>(event) &&
-                    std::equal(std::get<actionsPos>(event).begin(),
-                               std::get<actionsPos>(event).end(),
-                               std::get<eventActionsPos>(seEventData).begin(),
+                    *std::get<eventGroupPos>(seEventData) ==
+                        *std::get<groupPos>(event) &&
+                    std::equal(std::get<actionsPos>(event)->begin(),
+                               std::get<actionsPos>(event)->end(),
+                               std::get<eventActionsPos>(seEventData)->begin(),
                                actsEqual)
                 );
             }
@@ -424,8 +463,8 @@ std::vector<TimerEvent>::iterator Zone::findTimer(
 {
     for (auto it = _timerEvents.begin(); it != _timerEvents.end(); ++it)
     {
-        auto teEventData = *std::get<timerEventDataPos>(*it);
-        if (std::get<eventActionsPos>(teEventData).size() ==
+        const auto& teEventData = *std::get<timerEventDataPos>(*it);
+        if (std::get<eventActionsPos>(teEventData)->size() ==
             eventActions.size())
         {
             // TODO openbmc/openbmc#2328 - Use the action function target
@@ -436,10 +475,10 @@ std::vector<TimerEvent>::iterator Zone::findTimer(
                         return a1.target_type().name() ==
                                a2.target_type().name();
                     };
-            if (std::get<eventGroupPos>(teEventData) == eventGroup &&
+            if (*std::get<eventGroupPos>(teEventData) == eventGroup &&
                 std::equal(eventActions.begin(),
                            eventActions.end(),
-                           std::get<eventActionsPos>(teEventData).begin(),
+                           std::get<eventActionsPos>(teEventData)->begin(),
                            actsEqual))
             {
                 return it;
@@ -450,7 +489,8 @@ std::vector<TimerEvent>::iterator Zone::findTimer(
     return _timerEvents.end();
 }
 
-void Zone::timerExpired(Group eventGroup, std::vector<Action> eventActions)
+void Zone::timerExpired(const Group& eventGroup,
+                        const std::vector<Action>& eventActions)
 {
     // Perform the actions
     std::for_each(eventActions.begin(),
@@ -465,15 +505,29 @@ void Zone::handleEvent(sdbusplus::message::message& msg,
                        const EventData* eventData)
 {
     // Handle the callback
-    std::get<eventHandlerPos>(*eventData)(_bus, msg, *this);
+    auto& handler = std::get<eventHandlerPos>(*eventData);
+    auto pathSignals = getPathSignals(handler);
+    if (pathSignals != nullptr)
+    {
+        // A path namespace match also delivers the signals of objects
+        // outside the event's groups, which leave the event untouched
+        if (!pathSignals->dispatch(_bus, msg, *this))
+        {
+            return;
+        }
+    }
+    else
+    {
+        handler(_bus, msg, *this);
+    }
     // Perform the actions
     std::for_each(
-        std::get<eventActionsPos>(*eventData).begin(),
-        std::get<eventActionsPos>(*eventData).end(),
+        std::get<eventActionsPos>(*eventData)->begin(),
+        std::get<eventActionsPos>(*eventData)->end(),
         [this, &eventData](auto const& action)
         {
             action(*this,
-                   std::get<eventGroupPos>(*eventData));
+                   *std::get<eventGroupPos>(*eventData));
         });
 }
 
@@ -509,16 +563,77 @@ const std::string& Zone::getService(const std::string& path,
     }
 }
 
+const std::string& Zone::getNamespaceService(const std::string& path,
+                                             const std::string& intf,
+                                             const std::string& ns)
+{
+    static const std::string empty = "";
+
+    auto find = [this, &path, &intf]() -> const std::string*
+    {
+        auto srvIter = _servTree.find(path);
+        if (srvIter != _servTree.end())
+        {
+            for (auto& serv : srvIter->second)
+            {
+                if (std::find(serv.second.begin(),
+                              serv.second.end(),
+                              intf) != serv.second.end())
+                {
+                    return &serv.first;
+                }
+            }
+        }
+        return nullptr;
+    };
+
+    auto service = find();
+    if (service == nullptr && _servNamespaces.emplace(intf, ns).second)
+    {
+        try
+        {
+            // Add the services of all the namespace's objects at once
+            addServTree(util::SDBusPlus::getSubTree(_bus, ns, intf, 0));
+            service = find();
+        }
+        catch (const util::DBusError& e)
+        {
+            // Unable to look up the namespace's services
+        }
+        catch (const InternalFailure& e)
+        {
+            // No objects implement the interface within the namespace
+        }
+    }
+
+    return (service != nullptr) ? *service : empty;
+}
+
 const std::string& Zone::addServices(const std::string& path,
                                      const std::string& intf,
                                      int32_t depth)
 {
     static const std::string empty = "";
-    auto it = _servTree.end();
 
     // Get all subtree objects for the given interface
     auto objects = util::SDBusPlus::getSubTree(_bus, "/", intf, depth);
     // Add what's returned to the cache of path->services
+    addServTree(objects);
+
+    // When the paths match, since a single interface constraint is given,
+    // that is the service to return
+    if (objects.find(path) != objects.end())
+    {
+        return _servTree.find(path)->second.begin()->first;
+    }
+
+    return empty;
+}
+
+void Zone::addServTree(const std::map<std::string,
+                                      std::map<std::string,
+                                      std::vector<std::string>>>& objects)
+{
     for (auto& pIter : objects)
     {
         auto pathIter = _servTree.find(pIter.first);
@@ -548,20 +663,28 @@ const std::string& Zone::addServices(const std::string& path,
         {
             _servTree.insert(pIter);
         }
-        // When the paths match, since a single interface constraint is given,
-        // that is the service to return
-        if (path == pIter.first)
-        {
-            it = _servTree.find(pIter.first);
-        }
     }
+}
 
-    if (it != _servTree.end())
+void Zone::startTimerBuckets(const std::vector<SetSpeedEvent>& events,
+                             const std::vector<TimerBucket>& buckets)
+{
+    for (auto& bucket : buckets)
     {
-        return it->second.begin()->first;
+        auto timer = std::make_unique<util::Timer>(
+            _sdEvents,
+            [this, &events, indices = &std::get<bucketEventsPos>(bucket)]()
+            {
+                for (auto i : *indices)
+                {
+                    this->timerExpired(*std::get<groupPos>(events[i]),
+                                       *std::get<actionsPos>(events[i]));
+                }
+            });
+        timer->start(std::get<bucketIntervalPos>(bucket),
+                     util::Timer::TimerType::repeating);
+        _timerBuckets.emplace_back(std::move(timer));
     }
-
-    return empty;
 }
 
 }
@@ -1,12 +1,16 @@
 #pragma once
 #include <chrono>
+#include <set>
 #include <vector>
 #include <cassert>
 #include <algorithm>
+#include <stdexcept>
 #include <sdbusplus/bus.hpp>
 #include "fan.hpp"
 #include "types.hpp"
 #include "timer.hpp"
+#include "subscriptions.hpp"
+#include "prefetch.hpp"
 
 namespace phosphor
 {
@@ -50,11 +54,15 @@ class Zone
          * @param[in] bus - the dbus object
          * @param[in] events - sd_event pointer
          * @param[in] def - the fan zone definition data
+         * @param[in] subscriptions - the signal matches shared by zones
+         * @param[in] prefetch - the objects read in bulk for all zones
          */
         Zone(Mode mode,
              sdbusplus::bus::bus& bus,
              phosphor::fan::event::EventPtr& events,
-             const ZoneDefinition& def);
+             const ZoneDefinition& def,
+             SignalSubscriptions* subscriptions = nullptr,
+             const PropertyPrefetch* prefetch = nullptr);
 
         /**
          * Sets all fans in the zone to the speed
@@ -102,67 +110,91 @@ class Zone
         /**
          * @brief Sets a given object's property value
          *
-         * @param[in] object - Name of the object containing the property
-         * @param[in] interface - Interface name containing the property
-         * @param[in] property - Property name
+         * @param[in] slot - Property cache slot of the object's property
          * @param[in] value - Property value
          */
         template <typename T>
-        void setPropertyValue(const char* object,
-                              const char* interface,
-                              const char* property,
-                              T value)
+        void setPropertyValue(size_t slot, T value)
         {
-            _properties[object][interface][property] = value;
+            if (slot >= _properties.size())
+            {
+                _properties.resize(slot + 1);
+                _hasProperty.resize(slot + 1, false);
+            }
+            _properties[slot] = value;
+            _hasProperty[slot] = true;
         };
 
         /**
          * @brief Get the value of an object's property
          *
-         * @param[in] object - Name of the object containing the property
-         * @param[in] interface - Interface name containing the property
-         * @param[in] property - Property name
+         * @param[in] slot - Property cache slot of the object's property
          *
          * @return - The property value
+         *
+         * @throws std::out_of_range when the property has no value
          */
         template <typename T>
-        inline auto getPropertyValue(const std::string& object,
-                                     const std::string& interface,
-                                     const std::string& property)
+        inline auto getPropertyValue(size_t slot)
         {
             return sdbusplus::message::variant_ns::get<T>(
-                    _properties.at(object).at(interface).at(property));
+                    getPropValueVariant(slot));
         };
 
         /**
          * @brief Get the object's property variant
          *
+         * @param[in] slot - Property cache slot of the object's property
+         *
+         * @return - The property variant
+         *
+         * @throws std::out_of_range when the property has no value
+         */
+        inline const PropertyVariantType& getPropValueVariant(size_t slot)
+        {
+            if (slot >= _hasProperty.size() || !_hasProperty[slot])
+            {
+                throw std::out_of_range("No value for property slot");
+            }
+            return _properties[slot];
+        };
+
+        /**
+         * @brief Get the value of an object's property read in bulk for
+         * all the zones, while the zone is being created
+         *
          * @param[in] object - Name of the object containing the property
          * @param[in] interface - Interface name containing the property
          * @param[in] property - Property name
          *
-         * @return - The property variant
+         * @return - The property value, or nullptr when it was not read
          */
-        inline auto getPropValueVariant(const std::string& object,
-                                        const std::string& interface,
-                                        const std::string& property)
+        inline const FetchedVariantType* getPrefetchedValue(
+                const std::string& object,
+                const std::string& interface,
+                const std::string& property) const
         {
-            return _properties.at(object).at(interface).at(property);
-        };
+            if (_prefetch == nullptr)
+            {
+                return nullptr;
+            }
+            return _prefetch->getValue(object, interface, property);
+        }
 
         /**
          * @brief Remove an object's interface
          *
-         * @param[in] object - Name of the object with the interface
-         * @param[in] interface - Interface name to remove
+         * @param[in] slots - Property cache slots of the properties under
+         *                    the object's interface
          */
-        inline void removeObjectInterface(const char* object,
-                                          const char* interface)
+        inline void removeObjectInterface(const std::vector<size_t>& slots)
         {
-            auto it = _properties.find(object);
-            if (it != std::end(_properties))
+            for (auto slot : slots)
             {
-                _properties[object].erase(interface);
+                if (slot < _hasProperty.size())
+                {
+                    _hasProperty[slot] = false;
+                }
             }
         }
 
@@ -396,7 +428,8 @@ class Zone
          * @param[in] eventGroup - Group to process actions on
          * @param[in] eventActions - List of event actions to run
          */
-        void timerExpired(Group eventGroup, std::vector<Action> eventActions);
+        void timerExpired(const Group& eventGroup,
+                          const std::vector<Action>& eventActions);
 
         /**
          * @brief Get the service for a given path and interface from cached
@@ -410,6 +443,23 @@ class Zone
         const std::string& getService(const std::string& path,
                                       const std::string& intf);
 
+        /**
+         * @brief Get the service for a given path and interface from cached
+         * dataset, adding the services of every object with the interface
+         * within a given path namespace when not found
+         * @details The namespace is looked up once for each interface, so
+         * the objects within it share a single subtree lookup
+         *
+         * @param[in] path - Path to get service for
+         * @param[in] intf - Interface to get service for
+         * @param[in] ns - Path namespace containing the path
+         *
+         * @return - The service name or empty string for no service found
+         */
+        const std::string& getNamespaceService(const std::string& path,
+                                               const std::string& intf,
+                                               const std::string& ns);
+
         /**
          * @brief Add a set of services for a path and interface
          * by retrieving all the path subtrees to the given depth
@@ -426,6 +476,18 @@ class Zone
                                        const std::string& intf,
                                        int32_t depth);
 
+        /**
+         * @brief Start a timer for each of the zone's timer buckets
+         * @details Each timer runs the actions of all the set speed events
+         * in its bucket when it expires, in place of a timer per event.
+         *
+         * @param[in] events - The set speed events of the zone
+         * @param[in] buckets - The intervals and indices of the events
+         *                      sharing a timer
+         */
+        void startTimerBuckets(const std::vector<SetSpeedEvent>& events,
+                               const std::vector<TimerBucket>& buckets);
+
     private:
 
         /**
@@ -518,18 +580,32 @@ class Zone
          */
         phosphor::fan::event::EventPtr& _sdEvents;
 
+        /**
+         * The signal matches shared with other zones, when any
+         */
+        SignalSubscriptions* _subscriptions;
+
+        /**
+         * The objects read in bulk for all zones, only used while the
+         * zone's events are initialized
+         */
+        const PropertyPrefetch* _prefetch = nullptr;
+
         /**
          * The vector of fans in this zone
          */
         std::vector<std::unique_ptr<Fan>> _fans;
 
         /**
-         * @brief Map of object property values
+         * @brief Object property values indexed by their property cache
+         * slot
          */
-        std::map<std::string,
-                 std::map<std::string,
-                          std::map<std::string,
-                                   PropertyVariantType>>> _properties;
+        std::vector<PropertyVariantType> _properties;
+
+        /**
+         * @brief Whether each property cache slot holds a value
+         */
+        std::vector<bool> _hasProperty;
 
         /**
          * @brief Map of active fan control allowed by groups
@@ -558,6 +634,12 @@ class Zone
                 std::map<std::string,
                 std::vector<std::string>>> _servTree;
 
+        /**
+         * @brief The interfaces and path namespaces whose services have
+         * been added to the cache of path->services
+         */
+        std::set<std::pair<std::string, std::string>> _servNamespaces;
+
         /**
          * @brief List of signal event arguments and Dbus matches for callbacks
          */
@@ -568,6 +650,11 @@ class Zone
          */
         std::vector<TimerEvent> _timerEvents;
 
+        /**
+         * @brief List of timers shared by events with the same interval
+         */
+        std::vector<std::unique_ptr<phosphor::fan::util::Timer>> _timerBuckets;
+
         /**
          * @brief Get the request speed base if defined, otherwise the
          * the current target speed is returned
@@ -579,6 +666,16 @@ class Zone
             return (_requestSpeedBase != 0) ? _requestSpeedBase : _targetSpeed;
         };
 
+        /**
+         * @brief Add the services of the objects returned by a mapper
+         * subtree lookup to the cache of path->services
+         *
+         * @param[in] objects - The services of each object's interfaces
+         */
+        void addServTree(const std::map<std::string,
+                                        std::map<std::string,
+                                        std::vector<std::string>>>& objects);
+
         /**
          * @brief Dbus signal change callback handler
          *
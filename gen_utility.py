@@ -0,0 +1,253 @@
+"""
+Helpers shared by the phosphor-fan YAML parsers and code generators.
+"""
+
+import filecmp
+import hashlib
+import os
+import sys
+import mako
+import yaml
+from mako.lookup import TemplateLookup
+from mako.runtime import Context
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+# The libyaml based loader is much faster and builds the same data as the
+# pure python loader, so use it whenever pyyaml was built with libyaml.
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Environment variable selecting the compiled template cache directory
+# when one is not given on the command line.
+TEMPLATE_CACHE_ENV = 'PHOSPHOR_FAN_TEMPLATE_CACHE'
+
+# Environment variable selecting the parsed YAML cache directory when one
+# is not given on the command line.
+YAML_CACHE_ENV = 'PHOSPHOR_FAN_YAML_CACHE'
+
+
+def template_cache_dir(cache_dir=None):
+    '''Get the compiled template cache directory, either as given or
+    from the environment.  None disables the cache.'''
+
+    return cache_dir or os.environ.get(TEMPLATE_CACHE_ENV) or None
+
+
+def cached_module_name(cache_dir):
+    '''Create a mako modulename_callable placing each compiled template
+    in cache_dir under a hash of the template's content, its uri, and the
+    mako and python versions compiling it.  An edited template therefore
+    hashes to a new module, while an unchanged template reuses its module
+    regardless of the template file's timestamp.'''
+
+    def modulename(filename, uri):
+        digest = hashlib.sha1()
+        digest.update('{0}:{1}:{2}:'.format(
+            mako.__version__, sys.version_info[0], uri).encode('utf-8'))
+        with open(filename, 'rb') as fd:
+            digest.update(fd.read())
+        path = os.path.join(cache_dir, digest.hexdigest() + '.py')
+        if os.path.exists(path):
+            # Mako recompiles modules older than their template file,
+            # which a fresh checkout of unchanged templates would be.
+            os.utime(path, None)
+        return path
+
+    return modulename
+
+
+def load_yaml(path, cache_dir=None):
+    '''Parse the YAML file at the given path.  When a cache directory is
+    given, either directly or from the environment, the parsed data is
+    kept there under a hash of the file's content so later runs over an
+    unchanged file skip parsing it.'''
+
+    with open(path, 'rb') as fd:
+        content = fd.read()
+
+    cache_dir = cache_dir or os.environ.get(YAML_CACHE_ENV)
+    if not cache_dir:
+        return yaml.load(content, Loader=SafeLoader)
+
+    digest = hashlib.sha1()
+    digest.update('{0}:{1}:'.format(
+        yaml.__version__, sys.version_info[0]).encode('utf-8'))
+    digest.update(content)
+    cached = os.path.join(cache_dir, digest.hexdigest() + '.pickle')
+    try:
+        with open(cached, 'rb') as fd:
+            return pickle.load(fd)
+    except Exception:
+        # Missing or unreadable, parse the file again
+        pass
+
+    data = yaml.load(content, Loader=SafeLoader)
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    # Other generators may share the cache, so never expose a partly
+    # written entry.
+    tmp = '{0}.{1}.tmp'.format(cached, os.getpid())
+    with open(tmp, 'wb') as fd:
+        pickle.dump(data, fd, pickle.HIGHEST_PROTOCOL)
+    os.rename(tmp, cached)
+    return data
+
+
+class GeneratorLookup(TemplateLookup):
+    '''The template lookup used by the generators.  Records the file
+    of every template loaded through it, including included and namespace
+    templates, and when given a cache_dir keeps the compiled templates
+    there for reuse by later runs.  A template is resolved once per
+    lookup, without checking its file again on every later use.'''
+
+    def __init__(self, *a, **kw):
+        self.dependencies = set()
+        kw.setdefault('filesystem_checks', False)
+        cache_dir = template_cache_dir(kw.pop('cache_dir', None))
+        if cache_dir:
+            kw['modulename_callable'] = cached_module_name(cache_dir)
+        super(GeneratorLookup, self).__init__(*a, **kw)
+
+    def get_template(self, uri):
+        template = super(GeneratorLookup, self).get_template(uri)
+        if template.filename:
+            self.dependencies.add(template.filename)
+        return template
+
+
+class IndentWriter(object):
+    '''The output stream templates are rendered into.  Text is passed
+    straight through to the underlying stream as it is produced, with
+    every non-blank line started between indent() and the matching
+    dedent() prefixed by four spaces per level of indentation, so
+    templates indent nested defs without buffering their output.'''
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.depths = []
+        # Indentation owed to the current line once it gets any text
+        self.pending = 0
+        self.line_start = True
+
+    def indent(self, depth):
+        '''Indent the lines written from here on by depth levels.  Any
+        text completing the current line is indented by depth alone, the
+        same as the outer lines already were.'''
+
+        self.depths.append(depth)
+        self.pending += depth
+        return ''
+
+    def dedent(self):
+        '''End the most recent indent().'''
+
+        self.pending = max(0, self.pending - self.depths.pop())
+        return ''
+
+    def write(self, text):
+        if not self.depths:
+            if text:
+                self.stream.write(text)
+                self.line_start = text.endswith('\n')
+            return
+        prefix = 4 * ' ' * sum(self.depths)
+        for line in text.splitlines(True):
+            if self.line_start:
+                # Blank lines are left without trailing whitespace
+                if line != '\n':
+                    self.stream.write(prefix)
+            elif self.pending:
+                self.stream.write(4 * ' ' * self.pending)
+            self.pending = 0
+            self.stream.write(line)
+            self.line_start = line.endswith('\n')
+
+
+def render(stream, template, **data):
+    '''Render the template into the stream as the output is produced.
+    The IndentWriter wrapping the stream is given to the template as
+    out.'''
+
+    out = IndentWriter(stream)
+    template.render_context(Context(out, out=out, **data))
+
+
+class StringBuffer(list):
+    '''The buffer templates are rendered into by render_string.'''
+
+    write = list.append
+
+
+def render_string(template, **data):
+    '''Render the template into a string.  Unlike Template.render the
+    template's context is created directly, without inspecting the
+    template's arguments or setting up an encoding buffer, which counts
+    for templates rendered once per item of a large configuration.'''
+
+    buf = StringBuffer()
+    template.render_context(Context(buf, **data))
+    return ''.join(buf)
+
+
+def render_if_changed(path, template, **data):
+    '''Render the template straight into a temporary file alongside the
+    given path, replacing the file at path only when the output differs
+    from what it already contains.  Returns True when the file was
+    replaced.'''
+
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as fd:
+        render(fd, template, **data)
+
+    if os.path.exists(path) and filecmp.cmp(tmp, path, shallow=False):
+        os.remove(tmp)
+        return False
+    os.rename(tmp, path)
+    return True
+
+
+def write_if_changed(path, contents):
+    '''Write the contents to the file at the given path only when they
+    differ from what the file already contains, leaving the file and its
+    timestamp untouched otherwise.  Returns True when the file was
+    written.'''
+
+    if not isinstance(contents, bytes):
+        contents = contents.encode('utf-8')
+
+    try:
+        with open(path, 'rb') as fd:
+            if fd.read() == contents:
+                return False
+    except IOError:
+        # No existing output to compare against
+        pass
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as fd:
+        fd.write(contents)
+    os.rename(tmp, path)
+    return True
+
+
+def write_depfile(path, targets, dependencies):
+    '''Write a make style dependency file stating the target, or each of a
+    list of targets, depends on each of the given files.'''
+
+    def escape(name):
+        return name.replace('$', '$$').replace(' ', '\\ ')
+
+    if not isinstance(targets, list):
+        targets = [targets]
+    rule = ' '.join(escape(target) for target in targets) + ':'
+    for dep in dependencies:
+        rule += ' \\\n    ' + escape(dep)
+    rule += '\n'
+    # An empty rule per dependency keeps make from failing
+    # when a dependency is removed.
+    for dep in dependencies:
+        rule += '\n' + escape(dep) + ':\n'
+    write_if_changed(path, rule)
@@ -2,9 +2,11 @@
 
 import os
 import sys
-import yaml
 from argparse import ArgumentParser
-from mako.template import Template
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                             '..'))
+from gen_utility import GeneratorLookup, load_yaml, render_if_changed, \
+    write_depfile
 
 """
 This script generates the data structures for the
@@ -16,102 +18,6 @@ from the MRW.
 """
 
 
-tmpl = '''\
-<%!
-def indent(str, depth):
-    return ''.join(4*' '*depth+line for line in str.splitlines(True))
-%>\
-<%def name="getCondParams(cond)" buffered="True">
-%if (cond['name'] == 'propertiesMatch'):
-std::vector<PropertyState>{
-    %for i in cond['properties']:
-    PropertyState{
-        {
-            "${i['object']}",
-            "${i['interface']}",
-            "${i['property']['name']}"
-        },
-        static_cast<${i['property']['type']}>(${str(i['property']['value']).lower()})
-    },
-    %endfor
-}
-%endif
-</%def>\
-/* This is a generated file. */
-#include "fan_defs.hpp"
-#include "types.hpp"
-#include "groups.hpp"
-#include "conditions.hpp"
-
-using namespace phosphor::fan::monitor;
-using namespace phosphor::fan::trust;
-
-const std::vector<FanDefinition> fanDefinitions
-{
-%for fan_data in data.get('fans', {}):
-    FanDefinition{"${fan_data['inventory']}",
-                  ${fan_data.get('functional_delay', 0)},
-                  ${fan_data['allowed_out_of_range_time']},
-                  ${fan_data['deviation']},
-                  ${fan_data['num_sensors_nonfunc_for_fan_nonfunc']},
-                  std::vector<SensorDefinition>{
-                  %for sensor in fan_data['sensors']:
-                  <%
-                      #has_target is a bool, and we need a true instead of True
-                      has_target = str(sensor['has_target']).lower()
-                      target_interface = sensor.get(
-                          'target_interface',
-                          'xyz.openbmc_project.Control.FanSpeed')
-                      factor = sensor.get('factor', 1)
-                      offset = sensor.get('offset', 0)
-                  %> \
-                      SensorDefinition{"${sensor['name']}",
-                                       ${has_target},
-                                       "${target_interface}",
-                                       ${factor},
-                                       ${offset}},
-                  %endfor
-                  },
-                  %if ('condition' in fan_data) and \
-                  (fan_data['condition'] is not None):
-                  make_condition(condition::${fan_data['condition']['name']}(\
-                      ${indent(getCondParams(cond=fan_data['condition']), 5)}\
-                  ))
-                  %else:
-                  {}
-                  %endif
-    },
-%endfor
-};
-
-##Function to generate the group creation lambda.
-##If a group were to ever need a different constructor,
-##it could be handled here.
-<%def name="get_lambda_contents(group)">
-            std::vector<GroupDefinition> group{
-            %for member in group['group']:
-            <%
-                in_trust = str(member.get('in_trust', "true")).lower()
-            %>
-                GroupDefinition{"${member['name']}", ${in_trust}},
-            %endfor
-            };
-            return std::make_unique<${group['class']}>(group);
-</%def>
-const std::vector<CreateGroupFunction> trustGroups
-{
-%for group in data.get('sensor_trust_groups', {}):
-    {
-        []()
-        {\
-${get_lambda_contents(group)}\
-        }
-    },
-%endfor
-};
-'''
-
-
 if __name__ == '__main__':
     parser = ArgumentParser(
         description="Phosphor fan monitor definition parser")
@@ -122,20 +28,49 @@ if __name__ == '__main__':
     parser.add_argument('-o', '--output_dir', dest='output_dir',
                         default=".",
                         help='output directory')
+    parser.add_argument('-t', '--template_cache', dest='template_cache',
+                        help='directory caching compiled templates between '
+                             'runs (default: $PHOSPHOR_FAN_TEMPLATE_CACHE)')
+    parser.add_argument('-y', '--yaml_cache', dest='yaml_cache',
+                        help='directory caching parsed yaml between runs '
+                             '(default: $PHOSPHOR_FAN_YAML_CACHE)')
+    parser.add_argument('-d', '--depfile', dest='depfile',
+                        help='make dependency file to write listing the '
+                             'yaml and template files used')
+    parser.add_argument('-T', '--depfile_target', dest='depfile_target',
+                        help='make target the dependency file names '
+                             '(default: the generated source)')
     args = parser.parse_args()
 
     if not args.monitor_yaml:
         parser.print_usage()
         sys.exit(-1)
 
-    with open(args.monitor_yaml, 'r') as monitor_input:
-        monitor_data = yaml.safe_load(monitor_input) or {}
+    monitor_data = load_yaml(args.monitor_yaml, args.yaml_cache) or {}
 
     #Do some minor input validation
     for fan in monitor_data.get('fans', {}):
         if ((fan['deviation'] < 0) or (fan['deviation'] > 100)):
             sys.exit("Invalid deviation value " + str(fan['deviation']))
 
+    tmpls_dir = os.path.join(
+        os.path.dirname(os.path.realpath(__file__)),
+        "templates")
     output_file = os.path.join(args.output_dir, "fan_monitor_defs.cpp")
-    with open(output_file, 'w') as output:
-        output.write(Template(tmpl).render(data=monitor_data))
+    if sys.version_info < (3, 0):
+        lkup = GeneratorLookup(
+            directories=tmpls_dir.split(),
+            cache_dir=args.template_cache,
+            disable_unicode=True)
+    else:
+        lkup = GeneratorLookup(
+            directories=tmpls_dir.split(),
+            cache_dir=args.template_cache)
+    tmpl = lkup.get_template('fan_monitor_defs.mako.cpp')
+    # Only replace the output when the generated source changes so
+    # unchanged definitions do not trigger a rebuild
+    render_if_changed(output_file, tmpl, data=monitor_data)
+
+    if args.depfile:
+        write_depfile(args.depfile, args.depfile_target or output_file,
+                      [args.monitor_yaml] + sorted(lkup.dependencies))
@@ -0,0 +1,364 @@
+/**
+ * Copyright © 2017 IBM Corporation
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+#include <cstdint>
+#include <cstring>
+#include <endian.h>
+#include <functional>
+#include <phosphor-logging/elog-errors.hpp>
+#include <phosphor-logging/elog.hpp>
+#include <phosphor-logging/log.hpp>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <xyz/openbmc_project/Common/error.hpp>
+#include "anyof.hpp"
+#include "config_file.hpp"
+#include "fallback.hpp"
+#include "fan.hpp"
+#include "gpio.hpp"
+#include "psensor.hpp"
+#include "tach.hpp"
+#include "utility.hpp"
+
+namespace phosphor
+{
+namespace fan
+{
+namespace presence
+{
+
+using namespace phosphor::logging;
+using InternalFailure = sdbusplus::xyz::openbmc_project::Common::
+                            Error::InternalFailure;
+
+namespace
+{
+
+/*
+ * The layout of the configuration file, as written by pfpgen.py.
+ * Every field is a little endian 32 bit word, read in place from the
+ * page aligned mapping and converted to host order when used.  The header is
+ * followed by the fan, gpio device, sensor and policy entries, the
+ * pool of policy sensor indices, the pool of tach sensor name
+ * offsets and the pool of NUL terminated strings the offsets are
+ * into.
+ */
+constexpr auto magic = "PFPC";
+constexpr uint32_t version = 1;
+
+struct Header
+{
+    char magic[4];
+    uint32_t version;
+    uint32_t size;
+    uint32_t fans;
+    uint32_t devices;
+    uint32_t sensors;
+    uint32_t policies;
+    uint32_t refs;
+    uint32_t names;
+    uint32_t strings;
+};
+
+struct FanEntry
+{
+    uint32_t name;
+    uint32_t path;
+};
+
+struct DeviceEntry
+{
+    uint32_t path;
+};
+
+enum SensorType : uint32_t
+{
+    gpio = 0,
+    tach = 1,
+};
+
+/*
+ * A gpio's arguments are its physical device path, gpio device
+ * index and key, a tach's the first index and count of its names.
+ */
+struct SensorEntry
+{
+    uint32_t type;
+    uint32_t policy;
+    uint32_t args[3];
+};
+
+enum PolicyType : uint32_t
+{
+    anyof = 0,
+    fallback = 1,
+};
+
+struct PolicyEntry
+{
+    uint32_t type;
+    uint32_t fan;
+    uint32_t first;
+    uint32_t count;
+};
+
+/** The objects constructed from the loaded configuration. */
+std::vector<Fan> fans;
+std::vector<std::unique_ptr<GpioDevice>> devices;
+std::vector<std::unique_ptr<PresenceSensor>> sensors;
+ConfigFile::Policies policies;
+
+/**
+ * @brief Reject an invalid configuration file.
+ *
+ * @param[in] path - The path of the configuration file.
+ * @param[in] reason - What is wrong with the file.
+ */
+void invalid(const std::string& path, const char* reason)
+{
+    log<level::ERR>(
+            "Invalid fan presence configuration file",
+            entry("PATH=%s", path.c_str()),
+            entry("REASON=%s", reason));
+    elog<InternalFailure>();
+}
+
+/**
+ * @brief Convert a word of the file to host order.
+ */
+inline uint32_t word(uint32_t value)
+{
+    return le32toh(value);
+}
+
+/**
+ * @brief Check a list of pooled items is within its pool.
+ */
+bool inPool(uint32_t first, uint32_t count, uint32_t size)
+{
+    return static_cast<uint64_t>(first) + count <= size;
+}
+
+} // namespace
+
+void ConfigFile::load(const std::string& path)
+{
+    util::FileDescriptor fd{-1};
+    fd.open(path, O_RDONLY);
+
+    struct stat st;
+    if (fstat(fd(), &st) == -1)
+    {
+        log<level::ERR>(
+                "Failed to stat fan presence configuration file",
+                entry("PATH=%s", path.c_str()),
+                entry("ERRNO=%d", errno));
+        elog<InternalFailure>();
+    }
+
+    if (static_cast<size_t>(st.st_size) < sizeof(Header))
+    {
+        invalid(path, "truncated header");
+    }
+
+    // The fans refer to the strings in place, so the mapping
+    // is kept for the life of the daemon.
+    auto data = static_cast<const uint8_t*>(mmap(
+            nullptr, st.st_size, PROT_READ, MAP_PRIVATE, fd(), 0));
+    if (data == MAP_FAILED)
+    {
+        log<level::ERR>(
+                "Failed to map fan presence configuration file",
+                entry("PATH=%s", path.c_str()),
+                entry("ERRNO=%d", errno));
+        elog<InternalFailure>();
+    }
+
+    auto header = reinterpret_cast<const Header*>(data);
+    if (std::memcmp(header->magic, magic, sizeof(header->magic)) != 0)
+    {
+        invalid(path, "bad magic");
+    }
+
+    // The header's counts are used throughout the load, so they
+    // are converted to host order once.
+    Header h = *header;
+    for (auto field : {&Header::version, &Header::size, &Header::fans,
+                       &Header::devices, &Header::sensors,
+                       &Header::policies, &Header::refs, &Header::names,
+                       &Header::strings})
+    {
+        h.*field = word(h.*field);
+    }
+    if (h.version != version)
+    {
+        invalid(path, "unsupported version");
+    }
+
+    uint64_t size = sizeof(Header) +
+        sizeof(FanEntry) * static_cast<uint64_t>(h.fans) +
+        sizeof(DeviceEntry) * static_cast<uint64_t>(h.devices) +
+        sizeof(SensorEntry) * static_cast<uint64_t>(h.sensors) +
+        sizeof(PolicyEntry) * static_cast<uint64_t>(h.policies) +
+        sizeof(uint32_t) * static_cast<uint64_t>(h.refs) +
+        sizeof(uint32_t) * static_cast<uint64_t>(h.names) +
+        h.strings;
+    if (size != h.size || size != static_cast<uint64_t>(st.st_size))
+    {
+        invalid(path, "size mismatch");
+    }
+
+    auto fanEntries = reinterpret_cast<const FanEntry*>(header + 1);
+    auto deviceEntries = reinterpret_cast<const DeviceEntry*>(
+            fanEntries + h.fans);
+    auto sensorEntries = reinterpret_cast<const SensorEntry*>(
+            deviceEntries + h.devices);
+    auto policyEntries = reinterpret_cast<const PolicyEntry*>(
+            sensorEntries + h.sensors);
+    auto refs = reinterpret_cast<const uint32_t*>(
+            policyEntries + h.policies);
+    auto names = refs + h.refs;
+    auto strings = reinterpret_cast<const char*>(names + h.names);
+
+    // The pool ending with a NUL, every string in it is terminated.
+    if (h.strings != 0 && strings[h.strings - 1] != '\0')
+    {
+        invalid(path, "unterminated strings");
+    }
+
+    auto string = [&](uint32_t offset)
+    {
+        if (offset >= h.strings)
+        {
+            invalid(path, "string out of range");
+        }
+        return strings + offset;
+    };
+
+    fans.reserve(h.fans);
+    for (uint32_t i = 0; i < h.fans; ++i)
+    {
+        fans.emplace_back(
+                string(word(fanEntries[i].name)),
+                string(word(fanEntries[i].path)));
+    }
+
+    devices.reserve(h.devices);
+    for (uint32_t i = 0; i < h.devices; ++i)
+    {
+        devices.push_back(std::make_unique<GpioDevice>(
+                string(word(deviceEntries[i].path))));
+    }
+
+    sensors.reserve(h.sensors);
+    for (uint32_t i = 0; i < h.sensors; ++i)
+    {
+        const auto& entry = sensorEntries[i];
+        auto type = word(entry.type);
+        auto policy = word(entry.policy);
+        uint32_t args[] = {
+            word(entry.args[0]), word(entry.args[1]), word(entry.args[2])};
+        if (policy >= h.policies)
+        {
+            invalid(path, "sensor policy out of range");
+        }
+
+        if (type == SensorType::gpio)
+        {
+            if (args[1] >= h.devices)
+            {
+                invalid(path, "gpio device out of range");
+            }
+            sensors.push_back(
+                    std::make_unique<PolicyAccess<Gpio, ConfigFile>>(
+                        policy,
+                        string(args[0]),
+                        *devices[args[1]],
+                        args[2]));
+        }
+        else if (type == SensorType::tach)
+        {
+            if (!inPool(args[0], args[1], h.names))
+            {
+                invalid(path, "tach sensors out of range");
+            }
+            std::vector<std::string> tachs;
+            tachs.reserve(args[1]);
+            for (uint32_t n = 0; n < args[1]; ++n)
+            {
+                tachs.emplace_back(string(word(names[args[0] + n])));
+            }
+            sensors.push_back(
+                    std::make_unique<PolicyAccess<Tach, ConfigFile>>(
+                        policy, tachs));
+        }
+        else
+        {
+            invalid(path, "unknown sensor type");
+        }
+    }
+
+    policies.reserve(h.policies);
+    for (uint32_t i = 0; i < h.policies; ++i)
+    {
+        const auto& entry = policyEntries[i];
+        auto type = word(entry.type);
+        auto fan = word(entry.fan);
+        auto first = word(entry.first);
+        auto count = word(entry.count);
+        if (fan >= h.fans)
+        {
+            invalid(path, "policy fan out of range");
+        }
+        if (!inPool(first, count, h.refs))
+        {
+            invalid(path, "policy sensors out of range");
+        }
+
+        std::vector<std::reference_wrapper<PresenceSensor>> s;
+        s.reserve(count);
+        for (uint32_t n = 0; n < count; ++n)
+        {
+            auto sensor = word(refs[first + n]);
+            if (sensor >= h.sensors)
+            {
+                invalid(path, "policy sensor out of range");
+            }
+            s.push_back(*sensors[sensor]);
+        }
+
+        if (type == PolicyType::anyof)
+        {
+            policies.push_back(std::make_unique<AnyOf>(fans[fan], s));
+        }
+        else if (type == PolicyType::fallback)
+        {
+            policies.push_back(std::make_unique<Fallback>(fans[fan], s));
+        }
+        else
+        {
+            invalid(path, "unknown policy type");
+        }
+    }
+}
+
+ConfigFile::Policies& ConfigFile::get()
+{
+    return policies;
+}
+
+} // namespace presence
+} // namespace fan
+} // namespace phosphor
@@ -0,0 +1,50 @@
+#pragma once
+
+#include <memory>
+#include <string>
+#include <vector>
+#include "rpolicy.hpp"
+
+namespace phosphor
+{
+namespace fan
+{
+namespace presence
+{
+
+/**
+ * @class ConfigFile
+ * @brief Presence configuration loaded at runtime.
+ *
+ * The runtime counterpart of the generated ConfigPolicy, holding the
+ * policies of a binary configuration file written by
+ * pfpgen.py generate-binary.  The file is mapped into memory for the
+ * life of the daemon, the fans referring to their names and inventory
+ * paths in place, so loading it is little more than constructing the
+ * sensors and policies.
+ */
+class ConfigFile
+{
+    public:
+        using Policies = std::vector<std::unique_ptr<RedundancyPolicy>>;
+
+        /**
+         * @brief Load the configuration file.
+         *
+         * Map the file, validate it and construct its gpio devices,
+         * sensors and policies.  Logs and throws InternalFailure when
+         * the file cannot be read or is not a valid configuration.
+         *
+         * @param[in] path - The path of the configuration file.
+         */
+        static void load(const std::string& path);
+
+        /**
+         * @brief The policies of the loaded configuration.
+         */
+        static Policies& get();
+};
+
+} // namespace presence
+} // namespace fan
+} // namespace phosphor
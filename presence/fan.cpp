@@ -41,12 +41,12 @@ void setPresence(const Fan& fan, bool newState)
 
     std::map<object_path, Interfaces> obj =
     {{
-        std::get<1>(fan),
+        std::string(std::get<1>(fan)),
         {{
             itemIface,
             {
                 {"Present"s, newState},
-                {"PrettyName"s, std::get<0>(fan)},
+                {"PrettyName"s, std::string(std::get<0>(fan))},
             }
         }}
     }};
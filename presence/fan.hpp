@@ -1,6 +1,5 @@
 #pragma once
 
-#include <string>
 #include <tuple>
 
 namespace phosphor
@@ -10,8 +9,13 @@ namespace fan
 namespace presence
 {
 
-/** @brief PrettyName and inventory path. */
-using Fan = std::tuple<std::string, std::string>;
+/**
+ * @brief PrettyName and inventory path.
+ *
+ * The names are the string literals of the generated configuration, so
+ * the fans are constant initialized.
+ */
+using Fan = std::tuple<const char*, const char*>;
 
 /**
  * @brief Update the presence state.
@@ -29,38 +29,92 @@ namespace fan
 namespace presence
 {
 
+GpioDevice::GpioDevice(const std::string& device) :
+    evdevfd(open(device.c_str(), O_RDONLY | O_NONBLOCK)),
+    evdev(evdevpp::evdev::newFromFD(evdevfd())),
+    callback(nullptr)
+{
+
+}
+
+void GpioDevice::attach(unsigned int pin, Gpio& sensor)
+{
+    sensors[pin] = &sensor;
+    if (!callback)
+    {
+        callback = std::make_unique<sdevent::event::io::IO>(
+                util::SDEvent::getEvent(),
+                evdevfd(),
+                [this](auto& s){this->ioCallback(s);});
+    }
+    else if (sensors.size() == 1)
+    {
+        callback->enable(SD_EVENT_ON);
+    }
+}
+
+void GpioDevice::detach(unsigned int pin)
+{
+    sensors.erase(pin);
+    if (callback && sensors.empty())
+    {
+        // Disabled rather than released, as a sensor may be
+        // stopped by the callback dispatching to it.
+        callback->enable(SD_EVENT_OFF);
+    }
+}
+
+bool GpioDevice::present(unsigned int pin)
+{
+    return evdev.fetch(EV_KEY, pin) != 0;
+}
+
+void GpioDevice::ioCallback(sdevent::source::Source& source)
+{
+    unsigned int type, code, value;
+
+    std::tie(type, code, value) = evdev.next();
+    if (type != EV_KEY)
+    {
+        return;
+    }
+
+    auto sensor = sensors.find(code);
+    if (sensor == sensors.end())
+    {
+        return;
+    }
+
+    sensor->second->stateChanged(value != 0);
+}
+
 Gpio::Gpio(
         const std::string& physDevice,
-        const std::string& device,
+        GpioDevice& device,
         unsigned int physPin) :
     currentState(false),
-    evdevfd(open(device.c_str(), O_RDONLY | O_NONBLOCK)),
-    evdev(evdevpp::evdev::newFromFD(evdevfd())),
+    device(device),
     phys(physDevice),
-    pin(physPin),
-    callback(nullptr)
+    pin(physPin)
 {
 
 }
 
 bool Gpio::start()
 {
-    callback = std::make_unique<sdevent::event::io::IO>(
-            util::SDEvent::getEvent(),
-            evdevfd(),
-            [this](auto& s){this->ioCallback(s);});
+    device.attach(pin, *this);
     currentState = present();
     return currentState;
 }
 
 void Gpio::stop()
 {
-    callback = nullptr;
+    device.detach(pin);
 }
 
 bool Gpio::present()
 {
-    return evdev.fetch(EV_KEY, pin) != 0;
+    return device.present(pin);
 }
 
 void Gpio::fail()
@@ -75,18 +129,8 @@ void Gpio::fail()
             GPIO::CALLOUT_DEVICE_PATH(phys.c_str()));
 }
 
-void Gpio::ioCallback(sdevent::source::Source& source)
+void Gpio::stateChanged(bool newState)
 {
-    unsigned int type, code, value;
-
-    std::tie(type, code, value) = evdev.next();
-    if (type != EV_KEY || code != pin)
-    {
-        return;
-    }
-
-    bool newState = value != 0;
-
     if (currentState != newState)
     {
         getPolicy().stateChanged(newState, *this);
@@ -1,5 +1,6 @@
 #pragma once
 
+#include <map>
 #include <memory>
 #include "evdevpp/evdev.hpp"
 #include "sdevent/io.hpp"
@@ -14,6 +15,83 @@ namespace fan
 namespace presence
 {
 class RedundancyPolicy;
+class Gpio;
+
+/**
+ * @class GpioDevice
+ * @brief A gpio-keys input device shared by Gpio presence sensors.
+ *
+ * The device is opened once for all of the sensors of its keys, and
+ * watched with a single sdevent io callback while any of the sensors are
+ * started.  Each key event is dispatched to the sensor of the key.
+ */
+class GpioDevice
+{
+    public:
+        /**
+         * @brief
+         *
+         * Cannot move or copy due to this ptr as context
+         * for sdevent callbacks.
+         */
+        GpioDevice() = delete;
+        GpioDevice(const GpioDevice&) = delete;
+        GpioDevice& operator=(const GpioDevice&) = delete;
+        GpioDevice(GpioDevice&&) = delete;
+        GpioDevice& operator=(GpioDevice&&) = delete;
+        ~GpioDevice() = default;
+
+        /**
+         * @brief Open a gpio-keys input device.
+         *
+         * @param[in] device - The gpio-keys input device.
+         */
+        explicit GpioDevice(const std::string& device);
+
+        /**
+         * @brief Dispatch the events of a key to a sensor.
+         *
+         * Enables the sdevent io callback on the device if no
+         * other sensor has.
+         *
+         * @param[in] pin - The key's gpio pin number.
+         * @param[in] sensor - The sensor of the key.
+         */
+        void attach(unsigned int pin, Gpio& sensor);
+
+        /**
+         * @brief Stop dispatching the events of a key.
+         *
+         * Disables the sdevent io callback on the device when
+         * no other sensor is attached.
+         *
+         * @param[in] pin - The key's gpio pin number.
+         */
+        void detach(unsigned int pin);
+
+        /**
+         * @brief Query the state of a key.
+         *
+         * @param[in] pin - The key's gpio pin number.
+         */
+        bool present(unsigned int pin);
+
+    private:
+         /** @brief sdevent io callback. */
+        void ioCallback(sdevent::source::Source& source);
+
+        /** Gpio event device file descriptor. */
+        util::FileDescriptor evdevfd;
+
+        /** Gpio event device. */
+        evdevpp::evdev::EvDev evdev;
+
+        /** The started sensors, by gpio pin number. */
+        std::map<unsigned int, Gpio*> sensors;
+
+        /** sdevent io callback handle. */
+        std::unique_ptr<sdevent::event::io::IO> callback;
+};
 
 /**
  * @class Gpio
@@ -46,13 +124,13 @@ class Gpio : public PresenceSensor
          */
         Gpio(
                 const std::string& physDevice,
-                const std::string& device,
+                GpioDevice& device,
                 unsigned int physPin);
 
         /**
          * @brief start
          *
-         * Register for an sdevent io callback on the gpio.
+         * Receive the gpio's events from its device.
          * Query the initial state of the gpio.
          *
          * @return The current sensor state.
@@ -62,7 +140,7 @@ class Gpio : public PresenceSensor
         /**
          * @brief stop
          *
-         * De-register sdevent io callback.
+         * Stop receiving the gpio's events.
          */
         void stop() override;
 
@@ -81,29 +159,25 @@ class Gpio : public PresenceSensor
         bool present() override;
 
     private :
+        friend class GpioDevice;
+
          /** @brief Get the policy associated with this sensor. */
         virtual RedundancyPolicy& getPolicy() = 0;
 
-         /** @brief sdevent io callback. */
-        void ioCallback(sdevent::source::Source& source);
+         /** @brief Gpio event handler, called by the device. */
+        void stateChanged(bool newState);
 
         /** The current state of the sensor. */
         bool currentState;
 
-        /** Gpio event device file descriptor. */
-        util::FileDescriptor evdevfd;
-
         /** Gpio event device. */
-        evdevpp::evdev::EvDev evdev;
+        GpioDevice& device;
 
         /** Physical gpio device. */
         std::string phys;
 
         /** Gpio pin number. */
         unsigned int pin;
-
-        /** sdevent io callback handle. */
-        std::unique_ptr<sdevent::event::io::IO> callback;
 };
 
 } // namespace presence
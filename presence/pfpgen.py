@@ -20,12 +20,15 @@ The parser workflow is broken down as follows:
 '''
 
 import os
+import struct
 import sys
-import yaml
 from argparse import ArgumentParser
-import mako.lookup
 from sdbusplus.renderer import Renderer
 from sdbusplus.namedelement import NamedElement
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                             '..'))
+from gen_utility import GeneratorLookup, load_yaml, render, \
+    render_if_changed, render_string, write_depfile, write_if_changed
 
 
 class InvalidConfigError(BaseException):
@@ -49,37 +52,71 @@ class NotUniqueError(InvalidConfigError):
             path, fmt.format(cls, ' '.join(names)))
 
 
+class Registry(object):
+    '''The items to be rendered, by class.  Items are usually rendered
+    as C++ arrays, so the items of each class are kept in a list in the
+    order they were added, along with a map of each item name to its
+    index within the list.'''
+
+    def __init__(self, path):
+        self.path = path
+        self.lists = {}
+        self.indices = {}
+
+    def add(self, obj):
+        '''Add an item unless an item of the same class and name is
+        already present.  Returns whether the item was added.'''
+
+        indices = self.indices.setdefault(obj.cls, {})
+        if obj.name in indices:
+            return False
+
+        items = self.lists.setdefault(obj.cls, [])
+        indices[obj.name] = len(items)
+        items.append(obj)
+        return True
+
+    def get_index(self, cls, name):
+        '''Given an item name and its class, find the item index.'''
+
+        try:
+            return self.indices[cls][name]
+        except KeyError:
+            raise InvalidConfigError(
+                self.path, 'Could not find name: "{0}"'.format(name))
+
+    def exists(self, cls, name):
+        '''Check to see if an item already exists given the item
+        name.'''
+
+        return name in self.indices.get(cls, {})
+
+    def items(self):
+        '''The class and list of items of each class.'''
+
+        return self.lists.items()
+
+
 def get_index(objs, cls, name):
     '''Items are usually rendered as C++ arrays and as
     such are stored in python lists.  Given an item name
     its class, find the item index.'''
 
-    for i, x in enumerate(objs.get(cls, [])):
-        if x.name != name:
-            continue
-
-        return i
-    raise InvalidConfigError('Could not find name: "{0}"'.format(name))
+    return objs.get_index(cls, name)
 
 
 def exists(objs, cls, name):
     '''Check to see if an item already exists in a list given
     the item name.'''
 
-    try:
-        get_index(objs, cls, name)
-    except:
-        return False
-
-    return True
+    return objs.exists(cls, name)
 
 
 def add_unique(obj, *a, **kw):
     '''Add an item to one or more lists unless already present.'''
 
     for container in a:
-        if not exists(container, obj.cls, obj.name):
-            container.setdefault(obj.cls, []).append(obj)
+        container.add(obj)
 
 
 class Indent(object):
@@ -96,6 +133,95 @@ class Indent(object):
         return 4*' '*(depth + self.depth)
 
 
+class Blob(object):
+    '''Help items pack themselves into the binary configuration read by
+    the presence daemon at runtime (config_file.cpp).  Every field is a
+    little endian 32 bit word.  Strings are pooled, each distinct string
+    stored once, NUL terminated, and referred to by its offset within
+    the pool.  Lists of references are pooled likewise and referred to
+    by their first index and count.'''
+
+    MAGIC = b'PFPC'
+    VERSION = 1
+
+    # Sensor and policy entry types.
+    GPIO = 0
+    TACH = 1
+    ANYOF = 0
+    FALLBACK = 1
+
+    def __init__(self):
+        self.strings = bytearray()
+        self.offsets = {}
+        self.names = []
+        self.refs = []
+
+    def string(self, s):
+        '''Pool a string, returning its offset.'''
+
+        if s not in self.offsets:
+            self.offsets[s] = len(self.strings)
+            self.strings += s.encode('utf-8') + b'\0'
+        return self.offsets[s]
+
+    def string_list(self, strings):
+        '''Pool a list of strings, returning its first index and
+        count.'''
+
+        first = len(self.names)
+        self.names.extend(self.string(s) for s in strings)
+        return first, len(strings)
+
+    def ref_list(self, refs):
+        '''Pool a list of indices, returning its first index and
+        count.'''
+
+        first = len(self.refs)
+        self.refs.extend(refs)
+        return first, len(refs)
+
+    def encode(self, fans, devices, sensors, policies):
+        '''Lay out the header, the fan, device, sensor and policy
+        entries and the pools.'''
+
+        def words(entries):
+            return b''.join(
+                struct.pack('<{0}I'.format(len(e)), *e) for e in entries)
+
+        body = b''.join([
+            words(fans),
+            words(devices),
+            words(sensors),
+            words(policies),
+            words([self.refs]),
+            words([self.names]),
+            bytes(self.strings)])
+        header = struct.pack(
+            '<4s9I',
+            self.MAGIC,
+            self.VERSION,
+            struct.calcsize('<4s9I') + len(body),
+            len(fans),
+            len(devices),
+            len(sensors),
+            len(policies),
+            len(self.refs),
+            len(self.names),
+            len(self.strings))
+
+        return header + body
+
+
+class ItemRenderer(Renderer):
+    '''Renderer for the items rendered by a sub-template once per item
+    of their class.  The sub-template is rendered straight into a string,
+    the lookup resolving it once for all of the items.'''
+
+    def render(self, loader, template, **kwargs):
+        return render_string(
+            loader.get_template(template), loader=loader, **kwargs)
+
+
 class ConfigEntry(NamedElement):
     '''Base interface for rendered items.'''
 
@@ -133,7 +259,7 @@ class Sensor(ConfigEntry):
         self.policy = get_index(objs, 'policy', self.policy)
 
 
-class Gpio(Sensor, Renderer):
+class Gpio(Sensor, ItemRenderer):
     '''Handler for method:type:gpio.'''
 
     def __init__(self, *a, **kw):
@@ -143,18 +269,57 @@ class Gpio(Sensor, Renderer):
         kw['name'] = 'gpio-{}'.format(self.key)
         super(Gpio, self).__init__(**kw)
 
-    def construct(self, loader, indent):
+    def construct(self, loader, indent, storage=None):
         return self.render(
             loader,
             'gpio.mako.hpp',
             g=self,
-            indent=indent)
+            indent=indent,
+            storage=storage)
+
+    def pack(self, blob):
+        return (
+            Blob.GPIO,
+            self.policy,
+            blob.string(self.physpath),
+            self.device,
+            self.key)
+
+    def factory(self, objs):
+        '''Create the gpio device object shared by the gpios of
+        the device.'''
+
+        add_unique(GpioDevice(name=self.devpath), objs)
+        super(Gpio, self).factory(objs)
 
     def setup(self, objs):
+        '''All gpios have an associated device.  Get the device index.'''
+
+        self.device = get_index(objs, 'gpio_device', self.devpath)
         super(Gpio, self).setup(objs)
 
 
-class Tach(Sensor, Renderer):
+class GpioDevice(ConfigEntry, ItemRenderer):
+    '''A gpio-keys input device, named by its path, watched once for
+    all of the gpios of the device.'''
+
+    def __init__(self, *a, **kw):
+        kw['class'] = 'gpio_device'
+        super(GpioDevice, self).__init__(**kw)
+
+    def construct(self, loader, indent, storage=None):
+        return self.render(
+            loader,
+            'gpio_device.mako.hpp',
+            d=self,
+            indent=indent,
+            storage=storage)
+
+    def pack(self, blob):
+        return (blob.string(self.name),)
+
+
+class Tach(Sensor, ItemRenderer):
     '''Handler for method:type:tach.'''
 
     def __init__(self, *a, **kw):
@@ -162,12 +327,17 @@ class Tach(Sensor, Renderer):
         kw['name'] = 'tach-{}'.format('-'.join(self.sensors))
         super(Tach, self).__init__(**kw)
 
-    def construct(self, loader, indent):
+    def construct(self, loader, indent, storage=None):
         return self.render(
             loader,
             'tach.mako.hpp',
             t=self,
-            indent=indent)
+            indent=indent,
+            storage=storage)
+
+    def pack(self, blob):
+        return (Blob.TACH, self.policy) + \
+            blob.string_list(self.sensors) + (0,)
 
     def setup(self, objs):
         super(Tach, self).setup(objs)
@@ -195,7 +365,7 @@ class Rpolicy(ConfigEntry):
         self.fan = get_index(objs, 'fan', self.fan)
 
 
-class AnyOf(Rpolicy, Renderer):
+class AnyOf(Rpolicy, ItemRenderer):
     '''Default policy handler (policy:type:anyof).'''
 
     def __init__(self, *a, **kw):
@@ -205,15 +375,19 @@ class AnyOf(Rpolicy, Renderer):
     def setup(self, objs):
         super(AnyOf, self).setup(objs)
 
-    def construct(self, loader, indent):
+    def construct(self, loader, indent, storage=None):
         return self.render(
             loader,
             'anyof.mako.hpp',
             f=self,
-            indent=indent)
+            indent=indent,
+            storage=storage)
 
+    def pack(self, blob):
+        return (Blob.ANYOF, self.fan) + blob.ref_list(self.sensors)
 
-class Fallback(Rpolicy, Renderer):
+
+class Fallback(Rpolicy, ItemRenderer):
     '''Fallback policy handler (policy:type:fallback).'''
 
     def __init__(self, *a, **kw):
@@ -223,12 +397,16 @@ class Fallback(Rpolicy, Renderer):
     def setup(self, objs):
         super(Fallback, self).setup(objs)
 
-    def construct(self, loader, indent):
+    def construct(self, loader, indent, storage=None):
         return self.render(
             loader,
             'fallback.mako.hpp',
             f=self,
-            indent=indent)
+            indent=indent,
+            storage=storage)
+
+    def pack(self, blob):
+        return (Blob.FALLBACK, self.fan) + blob.ref_list(self.sensors)
 
 
 class Fan(ConfigEntry):
@@ -241,6 +419,9 @@ class Fan(ConfigEntry):
         self.rpolicy = kw.pop('rpolicy', None)
         super(Fan, self).__init__(**kw)
 
+    def pack(self, blob):
+        return (blob.string(self.name), blob.string(self.path))
+
     def factory(self, objs):
         ''' Create rpolicy and sensor(s) objects.'''
 
@@ -256,6 +437,8 @@ class Fan(ConfigEntry):
             factory = Everything.classmap(m['type'])
             sensor = factory(**m)
             rpolicy.sensors.append(sensor.name)
+            if not exists(objs, sensor.cls, sensor.name):
+                sensor.factory(objs)
             add_unique(sensor, objs)
 
         add_unique(rpolicy, objs)
@@ -294,64 +477,87 @@ class Everything(Renderer):
         each object created in phase two.  Typically the callback
         resolves references to other configuration file directives.'''
 
-        factory_objs = {}
-        objs = {}
-        with open(args.input, 'r') as fd:
-            for x in yaml.safe_load(fd.read()) or {}:
-
-                # The top level elements all represent fans.
-                x['class'] = 'fan'
-                # Create factory object for this config file directive.
-                factory = Everything.classmap(x['class'])
-                obj = factory(**x)
-
-                # For a given class of directive, validate the file
-                # doesn't have any duplicate names.
-                if exists(factory_objs, obj.cls, obj.name):
-                    raise NotUniqueError(args.input, 'fan', obj.name)
-
-                factory_objs.setdefault('fan', []).append(obj)
-                objs.setdefault('fan', []).append(obj)
-
-            for cls, items in factory_objs.items():
-                for obj in items:
-                    # Add objects for template consumption.
-                    obj.factory(objs)
-
-            # Configuration file directives reference each other via
-            # the name attribute; however, when rendered the reference
-            # is just an array index.
-            #
-            # At this point all objects have been created but references
-            # have not been resolved to array indices.  Instruct objects
-            # to do that now.
-            for cls, items in objs.items():
-                for obj in items:
-                    obj.setup(objs)
-
-        return Everything(**objs)
+        factory_objs = Registry(args.input)
+        objs = Registry(args.input)
+        for x in load_yaml(args.input, args.yaml_cache) or {}:
+
+            # The top level elements all represent fans.
+            x['class'] = 'fan'
+            # Create factory object for this config file directive.
+            factory = Everything.classmap(x['class'])
+            obj = factory(**x)
+
+            # For a given class of directive, validate the file
+            # doesn't have any duplicate names.
+            if not factory_objs.add(obj):
+                raise NotUniqueError(args.input, 'fan', obj.name)
+
+            objs.add(obj)
+
+        for cls, items in factory_objs.items():
+            for obj in items:
+                # Add objects for template consumption.
+                obj.factory(objs)
+
+        # Configuration file directives reference each other via
+        # the name attribute; however, when rendered the reference
+        # is just an array index.
+        #
+        # At this point all objects have been created but references
+        # have not been resolved to array indices.  Instruct objects
+        # to do that now.
+        for cls, items in objs.items():
+            for obj in items:
+                obj.setup(objs)
+
+        return Everything(**objs.lists)
 
     def __init__(self, *a, **kw):
         self.fans = kw.pop('fan', [])
         self.policies = kw.pop('policy', [])
         self.sensors = kw.pop('sensor', [])
+        self.devices = kw.pop('gpio_device', [])
         super(Everything, self).__init__(**kw)
 
     def generate_cpp(self, loader):
-        '''Render the template with the provided data.'''
-        sys.stdout.write(
-            self.render(
-                loader,
-                args.template,
-                fans=self.fans,
-                sensors=self.sensors,
-                policies=self.policies,
-                indent=Indent()))
+        '''Render the template with the provided data, streaming the
+        output as it is produced.'''
+        template = loader.get_template(args.template)
+        data = dict(
+            loader=loader,
+            fans=self.fans,
+            sensors=self.sensors,
+            devices=self.devices,
+            policies=self.policies,
+            static_storage=args.static_storage,
+            indent=Indent())
+
+        if args.output:
+            # Leave an unchanged header untouched to avoid rebuilds.
+            render_if_changed(args.output, template, **data)
+        else:
+            render(sys.stdout, template, **data)
+
+    def generate_binary(self, loader):
+        '''Pack the resolved configuration into the binary form loaded
+        by the presence daemon at runtime.'''
+        blob = Blob()
+        data = blob.encode(
+            [f.pack(blob) for f in self.fans],
+            [d.pack(blob) for d in self.devices],
+            [s.pack(blob) for s in self.sensors],
+            [p.pack(blob) for p in self.policies])
+
+        if args.output:
+            write_if_changed(args.output, data)
+        else:
+            getattr(sys.stdout, 'buffer', sys.stdout).write(data)
 
 if __name__ == '__main__':
     script_dir = os.path.dirname(os.path.realpath(__file__))
     valid_commands = {
         'generate-cpp': 'generate_cpp',
+        'generate-binary': 'generate_binary',
     }
 
     parser = ArgumentParser(
@@ -370,6 +576,27 @@ if __name__ == '__main__':
         '-p', '--template-path', dest='template_search',
         default=os.path.join(script_dir, 'templates'),
         help='The space delimited mako template search path.')
+    parser.add_argument(
+        '-c', '--template-cache', dest='template_cache',
+        help='The directory caching compiled templates between runs '
+        '(default: $PHOSPHOR_FAN_TEMPLATE_CACHE).')
+    parser.add_argument(
+        '-y', '--yaml-cache', dest='yaml_cache',
+        help='The directory caching the parsed config file between runs '
+        '(default: $PHOSPHOR_FAN_YAML_CACHE).')
+    parser.add_argument(
+        '-o', '--output', dest='output',
+        help='The file to write the generated code or binary '
+        'configuration to, instead of standard output.')
+    parser.add_argument(
+        '-s', '--static-storage', dest='static_storage',
+        action='store_true',
+        help='Construct the sensors and policies as static objects '
+        'rather than allocating each of them.')
+    parser.add_argument(
+        '-d', '--depfile', dest='depfile',
+        help='The make dependency file to write listing the '
+        'configuration file and templates used.')
     parser.add_argument(
         'command', metavar='COMMAND', type=str,
         choices=valid_commands.keys(),
@@ -377,18 +604,29 @@ if __name__ == '__main__':
 
     args = parser.parse_args()
 
+    if args.depfile and not args.output:
+        parser.error('--depfile requires --output')
+
     if sys.version_info < (3, 0):
-        lookup = mako.lookup.TemplateLookup(
+        lookup = GeneratorLookup(
             directories=args.template_search.split(),
+            cache_dir=args.template_cache,
             disable_unicode=True)
     else:
-        lookup = mako.lookup.TemplateLookup(
-            directories=args.template_search.split())
+        lookup = GeneratorLookup(
+            directories=args.template_search.split(),
+            cache_dir=args.template_cache)
     try:
         function = getattr(
             Everything.load(args),
             valid_commands[args.command])
         function(lookup)
+
+        if args.depfile:
+            write_depfile(
+                args.depfile,
+                args.output,
+                [args.input] + sorted(lookup.dependencies))
     except InvalidConfigError as e:
         sys.stderr.write('{0}: {1}\n\n'.format(e.config, e.msg))
         raise
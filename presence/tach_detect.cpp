@@ -13,21 +13,46 @@
  * See the License for the specific language governing permissions and
  * limitations under the License.
  */
+#include "argument.hpp"
+#include "config_file.hpp"
 #include "generated.hpp"
 #include "sdbusplus.hpp"
 #include "sdevent.hpp"
 
 
-int main(void)
+int main(int argc, char* argv[])
 {
     using namespace phosphor::fan;
 
+    util::ArgumentParser args(argc, argv);
+
+    // A configuration file written by pfpgen.py generate-binary
+    // takes the place of the configuration built into the daemon.
+    // An empty path, or any argument besides the options, is an error.
+    auto config = args["config"];
+    if ((argc > 1 && config.empty()) || optind != argc)
+    {
+        args.usage(argv);
+        exit(-1);
+    }
+
     auto& event = util::SDEvent::getEvent();
     event.attach(util::SDBusPlus::getBus());
 
-    for (auto& p: presence::ConfigPolicy::get())
+    if (!config.empty())
+    {
+        presence::ConfigFile::load(config);
+        for (auto& p: presence::ConfigFile::get())
+        {
+            p->monitor();
+        }
+    }
+    else
     {
-        p->monitor();
+        for (auto& p: presence::ConfigPolicy::get())
+        {
+            p->monitor();
+        }
     }
 
     event.loop();
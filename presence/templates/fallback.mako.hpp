@@ -1,7 +1,15 @@
+% if storage:
+Fallback ${storage}{
+% else:
 std::make_unique<Fallback>(
+% endif
 ${indent(1)}ConfigFans::get()[${f.fan}],
 ${indent(1)}std::vector<std::reference_wrapper<PresenceSensor>>{
 % for s in f.sensors:
 ${indent(2)}*ConfigSensors::get()[${s}],
 % endfor
+% if storage:
+${indent(1)}}}\
+% else:
 ${indent(1)}})\
+% endif
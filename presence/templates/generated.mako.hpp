@@ -22,16 +22,58 @@ namespace presence
 
 struct ConfigPolicy;
 
+struct ConfigGpioDevices
+{
+% if static_storage:
+    using Devices = std::array<GpioDevice*, ${len(devices)}>;
+% else:
+    using Devices = std::array<std::unique_ptr<GpioDevice>, ${len(devices)}>;
+% endif
+
+    static auto& get()
+    {
+% if static_storage:
+% for i, d in enumerate(devices):
+        static ${d.construct(loader, indent=indent +2, storage='device%d' % i)};
+% endfor
+% endif
+        static const Devices devices =
+        {
+% for i, d in enumerate(devices):
+% if static_storage:
+            &device${i},
+% else:
+            ${d.construct(loader, indent=indent +3)},
+% endif
+% endfor
+        };
+        return devices;
+    }
+};
+
 struct ConfigSensors
 {
+% if static_storage:
+    using Sensors = std::array<PresenceSensor*, ${len(sensors)}>;
+% else:
     using Sensors = std::array<std::unique_ptr<PresenceSensor>, ${len(sensors)}>;
+% endif
 
     static auto& get()
     {
+% if static_storage:
+% for i, s in enumerate(sensors):
+        static ${s.construct(loader, indent=indent +2, storage='sensor%d' % i)};
+% endfor
+% endif
         static const Sensors sensors =
         {
-% for s in sensors:
+% for i, s in enumerate(sensors):
+% if static_storage:
+            &sensor${i},
+% else:
             ${s.construct(loader, indent=indent +3)},
+% endif
 % endfor
         };
         return sensors;
@@ -44,13 +86,17 @@ struct ConfigFans
 
     static auto& get()
     {
+% if static_storage:
+        static constexpr Fans fans =
+% else:
         static const Fans fans =
+% endif
         {
             {
 % for f in fans:
                 Fans::value_type{
-                    "${f.name}"s,
-                    "${f.path}"s,
+                    "${f.name}",
+                    "${f.path}",
                 },
 % endfor
             }
@@ -61,14 +107,27 @@ struct ConfigFans
 
 struct ConfigPolicy
 {
+% if static_storage:
+    using Policies = std::array<RedundancyPolicy*, ${len(policies)}>;
+% else:
     using Policies = std::array<std::unique_ptr<RedundancyPolicy>, ${len(policies)}>;
+% endif
 
     static auto& get()
     {
+% if static_storage:
+% for i, p in enumerate(policies):
+        static ${p.construct(loader, indent=indent +2, storage='policy%d' % i)};
+% endfor
+% endif
         static const Policies policies =
         {
-% for p in policies:
+% for i, p in enumerate(policies):
+% if static_storage:
+            &policy${i},
+% else:
             ${p.construct(loader, indent=indent +3)},
+% endif
 % endfor
         };
         return policies;
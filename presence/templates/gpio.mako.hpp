@@ -1,2 +1,7 @@
+% if storage:
+PolicyAccess<Gpio, ConfigPolicy> ${storage}{
+${indent(1)}${g.policy}, "${g.physpath}", *ConfigGpioDevices::get()[${g.device}], ${g.key}}\
+% else:
 std::make_unique<PolicyAccess<Gpio, ConfigPolicy>>(
-${indent(1)}${g.policy}, "${g.physpath}"s, "${g.devpath}"s, ${g.key})\
+${indent(1)}${g.policy}, "${g.physpath}"s, *ConfigGpioDevices::get()[${g.device}], ${g.key})\
+% endif
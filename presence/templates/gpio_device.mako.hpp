@@ -0,0 +1,5 @@
+% if storage:
+GpioDevice ${storage}{"${d.name}"}\
+% else:
+std::make_unique<GpioDevice>("${d.name}"s)\
+% endif
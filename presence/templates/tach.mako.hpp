@@ -1,6 +1,15 @@
+% if storage:
+PolicyAccess<Tach, ConfigPolicy> ${storage}{
+${indent(1)}${t.policy}, std::vector<std::string>{\
+% else:
 std::make_unique<PolicyAccess<Tach, ConfigPolicy>>(
 ${indent(1)}${t.policy}, std::vector<std::string>{\
+% endif
 % for s in t.sensors:
 "${s}",\
 % endfor
+% if storage:
+}}\
+% else:
 })\
+% endif